@@ -60,8 +60,18 @@ async function randomWait(page, min = 1000, max = 3000) {
   await page.waitForTimeout(waitTime);
 }
 
+// Form fields for requests that carry no fill plan
+function buildFormFields(resumeData) {
+  return {
+    "input[name*='name' i], input[placeholder*='name' i]": resumeData.name,
+    "input[name*='email' i], input[placeholder*='email' i]": resumeData.contact_info?.email,
+    "input[name*='phone' i], input[placeholder*='phone' i]": resumeData.contact_info?.phone || '',
+    "textarea[name*='summary' i], textarea[placeholder*='summary' i], textarea[name*='about' i]": resumeData.summary
+  };
+}
+
 // Handle job application
-async function applyToJob(jobUrl, resumePath, resumeData) {
+async function applyToJob(jobUrl, resumePath, resumeData, fillPlan = null) {
   const logs = [];
   const logEntry = (message, level = 'info') => {
     const entry = { 
@@ -74,6 +84,26 @@ async function applyToJob(jobUrl, resumePath, resumeData) {
     return entry;
   };
 
+  // Stage timings, returned to the backend with the logs
+  const spans = [];
+  const span = async (stage, fn) => {
+    const startedAt = new Date();
+    const start = process.hrtime.bigint();
+    let ok = false;
+    try {
+      const result = await fn();
+      ok = true;
+      return result;
+    } finally {
+      spans.push({
+        stage,
+        startedAt: startedAt.toISOString(),
+        durationMs: Math.round(Number(process.hrtime.bigint() - start) / 1e5) / 10,
+        ok
+      });
+    }
+  };
+
   logEntry(`Starting job application for ${jobUrl}`);
   
   // Check if resumePath exists
@@ -118,7 +148,7 @@ async function applyToJob(jobUrl, resumePath, resumeData) {
     }
     
     logEntry('Launching browser');
-    browser = await puppeteer.launch(launchOptions);
+    browser = await span('browser_launch', () => puppeteer.launch(launchOptions));
     
     const page = await browser.newPage();
     
@@ -129,7 +159,7 @@ async function applyToJob(jobUrl, resumePath, resumeData) {
     page.on('console', msg => logEntry(`Browser console: ${msg.text()}`, 'debug'));
     
     logEntry(`Navigating to ${jobUrl}`);
-    await page.goto(jobUrl, { waitUntil: 'networkidle2', timeout: 60000 });
+    await span('navigate', () => page.goto(jobUrl, { waitUntil: 'networkidle2', timeout: 60000 }));
     
     // Take screenshot for debugging
     const screenshotPath = path.join('/app', 'job-page.png');
@@ -137,42 +167,42 @@ async function applyToJob(jobUrl, resumePath, resumeData) {
     logEntry(`Saved screenshot to ${screenshotPath}`);
     
     // Detect which job board we're dealing with
-    const jobBoard = detectJobBoard(jobUrl);
+    const jobBoard = await span('board_detection', () => detectJobBoard(jobUrl));
     logEntry(`Detected job board: ${jobBoard}`);
     
     // Apply job board specific strategies
     let success = false;
-    switch (jobBoard) {
-      case 'amazon':
-        success = await applyAmazon(page, resumePath, resumeData, logEntry);
-        break;
-      case 'google':
-        success = await applyGoogle(page, resumePath, resumeData, logEntry);
-        break;
-      case 'meta':
-        success = await applyMeta(page, resumePath, resumeData, logEntry);
-        break;
-      case 'apple':
-        success = await applyApple(page, resumePath, resumeData, logEntry);
-        break;
-      case 'netflix':
-        success = await applyNetflix(page, resumePath, resumeData, logEntry);
-        break;
-      default:
-        success = await applyGeneric(page, resumePath, resumeData, logEntry);
-    }
+    // Selector to value map, precompiled per resume by the backend
+    const formFields = fillPlan?.selectors || buildFormFields(resumeData);
+    
+    success = await span('application', () => {
+      switch (jobBoard) {
+        case 'amazon':
+          return applyAmazon(page, resumePath, formFields, logEntry);
+        case 'google':
+          return applyGoogle(page, resumePath, formFields, logEntry);
+        case 'meta':
+          return applyMeta(page, resumePath, formFields, logEntry);
+        case 'apple':
+          return applyApple(page, resumePath, formFields, logEntry);
+        case 'netflix':
+          return applyNetflix(page, resumePath, formFields, logEntry);
+        default:
+          return applyGeneric(page, resumePath, formFields, logEntry);
+      }
+    });
     
     if (success) {
       logEntry('Successfully applied to job');
-      return { success: true, logs };
+      return { success: true, logs, spans };
     } else {
       logEntry('Failed to complete application process', 'error');
-      return { success: false, logs };
+      return { success: false, logs, spans };
     }
     
   } catch (error) {
     logEntry(`Error applying to job: ${error.message}`, 'error');
-    return { success: false, logs };
+    return { success: false, logs, spans };
   } finally {
     // Close browser
     if (browser) {
@@ -182,7 +212,7 @@ async function applyToJob(jobUrl, resumePath, resumeData) {
 }
 
 // Generic application strategy for unknown job sites
-async function applyGeneric(page, resumePath, resumeData, logEntry) {
+async function applyGeneric(page, resumePath, formFields, logEntry) {
   try {
     logEntry('Using generic application strategy');
     
@@ -264,18 +294,12 @@ async function applyGeneric(page, resumePath, resumeData, logEntry) {
     
     // Fill form fields
     logEntry('Filling out application form');
-    const formFields = {
-      "input[name*='name' i], input[placeholder*='name' i]": resumeData.name,
-      "input[name*='email' i], input[placeholder*='email' i]": resumeData.contact_info?.email,
-      "input[name*='phone' i], input[placeholder*='phone' i]": resumeData.contact_info?.phone || '',
-      "textarea[name*='summary' i], textarea[placeholder*='summary' i], textarea[name*='about' i]": resumeData.summary
-    };
-    
     for (const [selector, value] of Object.entries(formFields)) {
       if (value) {
         try {
           const field = await page.$(selector);
-          if (field) {
+          // type() appends, so never type into a field that is already filled
+          if (field && !(await field.evaluate(el => el.value))) {
             await field.click();
             await field.type(value, { delay: 30 }); // Add delay to typing to appear more human-like
             logEntry(`Filled field ${selector}`);
@@ -335,7 +359,7 @@ async function applyGeneric(page, resumePath, resumeData, logEntry) {
 }
 
 // Amazon specific job application strategy
-async function applyAmazon(page, resumePath, resumeData, logEntry) {
+async function applyAmazon(page, resumePath, formFields, logEntry) {
   try {
     logEntry('Using Amazon-specific application strategy');
     
@@ -362,7 +386,7 @@ async function applyAmazon(page, resumePath, resumeData, logEntry) {
     });
     
     // Follow the same logic as generic handler after this point
-    return await applyGeneric(page, resumePath, resumeData, logEntry);
+    return await applyGeneric(page, resumePath, formFields, logEntry);
     
   } catch (error) {
     logEntry(`Error in Amazon application process: ${error.message}`, 'error');
@@ -371,7 +395,7 @@ async function applyAmazon(page, resumePath, resumeData, logEntry) {
 }
 
 // Google specific job application strategy
-async function applyGoogle(page, resumePath, resumeData, logEntry) {
+async function applyGoogle(page, resumePath, formFields, logEntry) {
   try {
     logEntry('Using Google-specific application strategy');
     
@@ -387,7 +411,7 @@ async function applyGoogle(page, resumePath, resumeData, logEntry) {
       });
       
       // Follow generic strategy for the application form
-      return await applyGeneric(page, resumePath, resumeData, logEntry);
+      return await applyGeneric(page, resumePath, formFields, logEntry);
     } else {
       logEntry('Could not find Google apply button', 'warning');
       return false;
@@ -400,27 +424,27 @@ async function applyGoogle(page, resumePath, resumeData, logEntry) {
 }
 
 // Meta specific job application strategy
-async function applyMeta(page, resumePath, resumeData, logEntry) {
+async function applyMeta(page, resumePath, formFields, logEntry) {
   // Similar implementation as other job board specific strategies
   logEntry('Using Meta-specific application strategy');
-  return await applyGeneric(page, resumePath, resumeData, logEntry);
+  return await applyGeneric(page, resumePath, formFields, logEntry);
 }
 
 // Apple specific job application strategy 
-async function applyApple(page, resumePath, resumeData, logEntry) {
+async function applyApple(page, resumePath, formFields, logEntry) {
   logEntry('Using Apple-specific application strategy');
-  return await applyGeneric(page, resumePath, resumeData, logEntry);
+  return await applyGeneric(page, resumePath, formFields, logEntry);
 }
 
 // Netflix specific job application strategy
-async function applyNetflix(page, resumePath, resumeData, logEntry) {
+async function applyNetflix(page, resumePath, formFields, logEntry) {
   logEntry('Using Netflix-specific application strategy');
-  return await applyGeneric(page, resumePath, resumeData, logEntry);
+  return await applyGeneric(page, resumePath, formFields, logEntry);
 }
 
 // Define API endpoints
 app.post('/api/apply', async (req, res) => {
-  const { jobUrl, resumePath, resumeData } = req.body;
+  const { jobUrl, resumePath, resumeData, fillPlan } = req.body;
   
   if (!jobUrl || !resumePath || !resumeData) {
     return res.status(400).json({ error: 'Missing required parameters', logs: [] });
@@ -430,7 +454,7 @@ app.post('/api/apply', async (req, res) => {
   logger.info(`Resume path: ${resumePath}`);
   
   try {
-    const result = await applyToJob(jobUrl, resumePath, resumeData);
+    const result = await applyToJob(jobUrl, resumePath, resumeData, fillPlan);
     res.json(result);
   } catch (error) {
     logger.error(`Error in /api/apply endpoint: ${error.message}`);
@@ -0,0 +1,274 @@
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from automation.readiness import DEFAULT_READINESS, PAGE_SETTLED, ReadinessCondition
+
+# Steps run by the generic flow, in order
+DEFAULT_STEPS = ("apply", "upload", "fill", "submit")
+
+
+class BoardAdapter:
+    """
+    How to apply on one job board: the domains it serves, the selectors
+    tried before the generic candidates for each step, readiness
+    conditions per stage, the sequence of steps to run and patterns that
+    reduce a posting URL to the board's job ID.
+
+    Steps other than "apply", "upload", "fill" and "submit" click the
+    first of the adapter's selectors for that step, and are skipped when
+    none is present.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        domains: Iterable[str] = (),
+        selectors: Optional[Dict[str, List[str]]] = None,
+        readiness: Optional[Dict[str, List[ReadinessCondition]]] = None,
+        steps: Tuple[str, ...] = DEFAULT_STEPS,
+        job_id_patterns: Iterable[Tuple[str, str]] = (),
+    ):
+        self.name = name
+        self.domains = tuple(domain.lower() for domain in domains)
+        self.selectors = selectors or {}
+        self.readiness = readiness or {}
+        self.steps = steps
+        # (regex, template) pairs matched against "host/path?query"
+        self.job_id_patterns = [
+            (re.compile(pattern), template) for pattern, template in job_id_patterns
+        ]
+
+    def candidates(self, step: str, generic: List[str]) -> List[str]:
+        """Board selectors for a step followed by the generic candidates."""
+        board = self.selectors.get(step, [])
+        return board + [selector for selector in generic if selector not in board]
+
+    def conditions(self, stage: str) -> List[ReadinessCondition]:
+        """
+        Readiness conditions for a stage, falling back to the defaults.
+        Navigation also accepts the page settling, whatever the board.
+        """
+        conditions = self.readiness.get(stage) or DEFAULT_READINESS.get(stage, [])
+        if stage == "navigate" and PAGE_SETTLED not in conditions:
+            conditions = conditions + [PAGE_SETTLED]
+        return conditions
+
+    def job_key(self, location: str) -> Optional[str]:
+        """
+        Reduce a normalized "host/path?query" to the board's canonical
+        form for the posting, or None when no pattern matches.
+        """
+        for pattern, template in self.job_id_patterns:
+            match = pattern.search(location)
+            if match:
+                return match.expand(template)
+        return None
+
+
+# Used for every domain no adapter claims
+GENERIC_ADAPTER = BoardAdapter("unknown")
+
+ADAPTERS = [
+    BoardAdapter(
+        "greenhouse",
+        domains=["greenhouse.io"],
+        selectors={
+            "upload": ["input#resume", "input[type='file'][id*='resume' i]"],
+            "submit": ["#submit_app", "button[type='submit']:has-text('Submit')"],
+        },
+        readiness={
+            "navigate": [
+                ReadinessCondition(
+                    "application form present",
+                    selector="#application_form, #application-form, form#application",
+                ),
+            ],
+        },
+        # The application form is embedded in the posting page
+        steps=("upload", "fill", "submit"),
+        # Job IDs are unique across Greenhouse boards
+        job_id_patterns=[(r"^[^/]+/(?:[^/?]+/)?jobs/(\d+)", r"greenhouse.io/jobs/\1")],
+    ),
+    BoardAdapter(
+        "lever",
+        domains=["lever.co"],
+        selectors={
+            "apply": [".postings-btn:has-text('Apply')", "a[href$='/apply']"],
+            "upload": ["input[name='resume']", "#resume-upload-input"],
+            "submit": ["#btn-submit", "button[data-qa='btn-submit']"],
+        },
+        readiness={
+            "navigate": [
+                ReadinessCondition(
+                    "apply link present", selector=".postings-btn, a[href$='/apply']"
+                ),
+            ],
+            "after_apply": [
+                ReadinessCondition(
+                    "application form present",
+                    selector="#application-form, input[name='resume']",
+                ),
+                ReadinessCondition("url changed", url_change=True),
+            ],
+        },
+        job_id_patterns=[(r"^[^/]+/([^/?]+)/([0-9a-f-]{36})", r"lever.co/\1/\2")],
+    ),
+    BoardAdapter(
+        "workday",
+        domains=["myworkdayjobs.com", "myworkdaysite.com"],
+        selectors={
+            "apply": ["[data-automation-id='adventureButton']"],
+            "apply_manually": ["[data-automation-id='applyManually']"],
+            "upload": ["input[data-automation-id='file-upload-input-ref']"],
+            "next": ["[data-automation-id='bottom-navigation-next-button']:has-text('Continue')"],
+            "submit": ["[data-automation-id='bottom-navigation-next-button']:has-text('Submit')"],
+        },
+        readiness={
+            "navigate": [
+                ReadinessCondition(
+                    "apply button present", selector="[data-automation-id='adventureButton']"
+                ),
+            ],
+            "after_apply": [
+                ReadinessCondition(
+                    "apply options shown", selector="[data-automation-id='applyManually']"
+                ),
+                ReadinessCondition("url changed", url_change=True),
+            ],
+            "after_apply_manually": [
+                ReadinessCondition(
+                    "file input present",
+                    selector="input[data-automation-id='file-upload-input-ref']",
+                ),
+                ReadinessCondition(
+                    "sign in shown", selector="[data-automation-id='signInContent']"
+                ),
+            ],
+        },
+        steps=("apply", "apply_manually", "upload", "fill", "next", "fill", "submit"),
+        # Tenant host, site and requisition ID from .../job/<location>/<title>_<id>
+        job_id_patterns=[
+            (
+                r"^([^/]+)/(?:[a-z]{2}-[A-Z]{2}/)?([^/?]+)/job/(?:[^?]*/)?[^/?]*_([\w-]+?)"
+                r"(?:/apply[^?]*)?(?:\?|$)",
+                r"\1/\2/job/\3",
+            ),
+        ],
+    ),
+    BoardAdapter(
+        "amazon",
+        domains=["amazon.jobs"],
+        selectors={
+            "apply": ["#apply-button", "a.btn-apply"],
+        },
+        readiness={
+            "navigate": [
+                ReadinessCondition("apply button present", selector="#apply-button, a.btn-apply"),
+            ],
+            "after_apply": [
+                ReadinessCondition("url changed", url_change=True),
+            ],
+        },
+        # /en/jobs/<id>/<slug> and its locale and slug variants
+        job_id_patterns=[
+            (r"^[^/]+/(?:[a-z]{2}(?:-[a-z]{2})?/)?jobs/(\d+)", r"amazon.jobs/jobs/\1"),
+        ],
+    ),
+    BoardAdapter(
+        "linkedin",
+        domains=["linkedin.com"],
+        selectors={
+            "apply": [".jobs-apply-button", ".jobs-s-apply button"],
+            "upload": [".jobs-document-upload__container input[type='file']"],
+            "next": ["button[aria-label='Continue to next step']"],
+            "review": ["button[aria-label='Review your application']"],
+            "submit": ["button[aria-label='Submit application']"],
+        },
+        readiness={
+            "navigate": [
+                ReadinessCondition(
+                    "apply button present", selector=".jobs-apply-button, .jobs-s-apply button"
+                ),
+            ],
+            "after_apply": [
+                ReadinessCondition("easy apply modal open", selector=".jobs-easy-apply-modal"),
+                ReadinessCondition("url changed", url_change=True),
+            ],
+        },
+        # Easy Apply spreads the form over several modal pages
+        steps=("apply", "fill", "next", "upload", "fill", "next", "fill", "review", "submit"),
+        job_id_patterns=[
+            (r"^[^/]+/jobs/view/(?:[^/?]*-)?(\d+)", r"linkedin.com/jobs/view/\1"),
+            (r"[?&]currentJobId=(\d+)", r"linkedin.com/jobs/view/\1"),
+        ],
+    ),
+    BoardAdapter(
+        "indeed",
+        domains=["indeed.com"],
+        readiness={
+            "navigate": [
+                ReadinessCondition(
+                    "apply button present",
+                    selector="#indeedApplyButton, button[id*='apply' i], a[href*='apply' i]",
+                ),
+            ],
+        },
+        job_id_patterns=[(r"[?&](?:jk|vjk)=([0-9a-f]+)", r"indeed.com/viewjob?jk=\1")],
+    ),
+    BoardAdapter("glassdoor", domains=["glassdoor.com"]),
+    BoardAdapter("monster", domains=["monster.com"]),
+    BoardAdapter("ziprecruiter", domains=["ziprecruiter.com"]),
+]
+
+
+class BoardRegistry:
+    """
+    Maps domains to board adapters.
+
+    Adapters are keyed by every domain they claim, so a host resolves
+    with one dict lookup per label suffix, most specific first:
+    boards.greenhouse.io tries "boards.greenhouse.io", then
+    "greenhouse.io", then "io".
+    """
+
+    def __init__(
+        self,
+        adapters: Iterable[BoardAdapter] = (),
+        fallback: BoardAdapter = GENERIC_ADAPTER,
+    ):
+        self.fallback = fallback
+        self._by_domain: Dict[str, BoardAdapter] = {}
+        for adapter in adapters:
+            self.register(adapter)
+
+    def register(self, adapter: BoardAdapter):
+        """Add an adapter, replacing any claiming the same domains."""
+        for domain in adapter.domains:
+            self._by_domain[domain] = adapter
+
+    def lookup(self, url: str) -> BoardAdapter:
+        """Return the adapter for a URL or bare host."""
+        host = urlparse(url).hostname if "//" in url else url
+        if not host:
+            return self.fallback
+        labels = host.lower().rstrip(".").split(".")
+        for i in range(len(labels)):
+            adapter = self._by_domain.get(".".join(labels[i:]))
+            if adapter is not None:
+                return adapter
+        return self.fallback
+
+
+# Singleton instance
+board_registry = None
+
+
+def get_board_registry() -> BoardRegistry:
+    """
+    Get or create the BoardRegistry singleton instance.
+    """
+    global board_registry
+    if board_registry is None:
+        board_registry = BoardRegistry(ADAPTERS)
+    return board_registry
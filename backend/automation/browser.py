@@ -1,10 +1,22 @@
-from playwright.async_api import async_playwright, Page
+from playwright.async_api import Page
 import asyncio
 import logging
+from collections import deque
 from typing import List, Dict, Any, Optional, Callable
 import re
 from urllib.parse import urlparse
 
+from automation.pool import BrowserPool, get_browser_pool
+from automation.selector_race import race_selectors
+from automation.selector_cache import SelectorCache, get_selector_cache
+from automation.network import NetworkProfile, RequestBlocker
+from automation.readiness import wait_until_ready
+from automation.boards import GENERIC_ADAPTER, BoardAdapter, BoardRegistry, get_board_registry
+from automation.form_discovery import apply_fills, compile_fill_plan, discover_fields, plan_fills
+from models import FillPlan, ResumeData
+from services.log_store import LOG_BUFFER_SIZE, LogRecord
+from services.timing import SpanRecorder
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -15,13 +27,33 @@ class JobApplier:
     Class for automating job applications using Playwright.
     """
 
-    def __init__(self, headless: bool = True):
+    def __init__(
+        self,
+        headless: Optional[bool] = None,
+        pool: Optional[BrowserPool] = None,
+        selector_cache: Optional[SelectorCache] = None,
+        network_profile: Optional[NetworkProfile] = None,
+        log_sink: Optional[Callable[[LogRecord], None]] = None,
+        board_registry: Optional[BoardRegistry] = None,
+        spans: Optional[SpanRecorder] = None,
+    ):
         self.headless = headless
-        self.playwright = None
-        self.browser = None
+        self.pool = pool
+        self.board_registry = board_registry or get_board_registry()
+        self.board: BoardAdapter = GENERIC_ADAPTER
+        self.selector_cache = selector_cache or get_selector_cache()
+        self.network_profile = network_profile or NetworkProfile.from_env()
+        self.blocker = None
+        self.job_board = "unknown"
+        self.lease = None
         self.context = None
         self.page = None
-        self.logs = []
+        # Only the newest entries are kept here, a sink receives all of them
+        self.logs = deque(maxlen=LOG_BUFFER_SIZE)
+        self.log_sink = log_sink
+        self._next_seq = 0
+        # Time taken by each stage of the run
+        self.spans = spans or SpanRecorder()
 
     async def __aenter__(self):
         await self.start()
@@ -31,10 +63,24 @@ class JobApplier:
         await self.close()
 
     async def start(self):
-        """Start the browser."""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
-        self.context = await self.browser.new_context()
+        """
+        Lease an isolated browser context from the browser pool. Unless
+        `headless` is given, the shared pool's BROWSER_HEADLESS decides;
+        a given value only applies when this creates the shared pool.
+        """
+        if self.pool is None:
+            if self.headless is None:
+                self.pool = get_browser_pool()
+            else:
+                self.pool = get_browser_pool(headless=self.headless)
+        with self.spans.span("browser_lease"):
+            self.lease = await self.pool.acquire()
+        self.context = self.lease.context
+
+        # Abort heavy and tracking requests the automation does not need
+        self.blocker = RequestBlocker(self.network_profile, lambda: self.job_board)
+        await self.blocker.install(self.context)
+
         self.page = await self.context.new_page()
 
         # Set up event listeners
@@ -42,11 +88,12 @@ class JobApplier:
         self.page.on("pageerror", lambda err: self._log(f"Page error: {err}", "error"))
 
     async def close(self):
-        """Close the browser."""
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        """Return the browser context to the pool."""
+        if self.lease:
+            lease, self.lease = self.lease, None
+            self.context = None
+            self.page = None
+            await self.pool.release(lease)
 
     def _log(self, message: str, level: str = "info"):
         """Add a log entry."""
@@ -59,18 +106,43 @@ class JobApplier:
         else:
             logger.info(message)
 
-        self.logs.append(
-            {
-                "timestamp": asyncio.get_event_loop().time(),
-                "message": message,
-                "level": level,
-            }
-        )
+        record = LogRecord(message, level)
+        if self.log_sink is not None:
+            # The sink stores the record and assigns its sequence number
+            self.log_sink(record)
+        else:
+            record.seq = self._next_seq
+            self._next_seq += 1
+        self.logs.append(record)
+
+    def _domain(self) -> str:
+        """Domain of the page currently loaded."""
+        return urlparse(self.page.url).netloc.lower()
+
+    async def _race(self, step: str, selectors: List[str], state: str = "visible"):
+        """
+        Race all candidates in one timeout, with the selectors that
+        previously won on this domain first so they win ties. A stale
+        winner costs nothing extra.
+        """
+        known = self.selector_cache.winners(self._domain(), step, selectors)
+        rest = [selector for selector in selectors if selector not in known]
+        return await race_selectors(self.page, known + rest, state=state)
+
+    async def wait_ready(self, stage: str, previous_url: Optional[str] = None):
+        """
+        Wait for the current job board's readiness conditions for a stage.
+        """
+        loop = asyncio.get_event_loop()
+        started = loop.time()
+        reason = await wait_until_ready(self.page, self.board.conditions(stage), previous_url)
+        self._log(f"Page ready after {stage} ({reason}) in {loop.time() - started:.2f}s")
 
-    async def navigate(self, url: str, wait_until: str = "networkidle"):
+    async def navigate(self, url: str, wait_until: str = "domcontentloaded"):
         """Navigate to a URL."""
         self._log(f"Navigating to {url}")
         await self.page.goto(url, wait_until=wait_until)
+        await self.wait_ready("navigate")
         self._log(f"Loaded page: {self.page.url}")
 
     async def find_apply_button(self) -> Optional[str]:
@@ -92,47 +164,41 @@ class JobApplier:
             "[data-automation*='apply' i]",
         ]
 
-        for selector in apply_button_selectors:
-            try:
-                button = await self.page.wait_for_selector(selector, timeout=1000)
-                if button:
-                    self._log(f"Found apply button with selector: {selector}")
-                    return selector
-            except Exception:
-                continue
+        apply_button_selectors = self.board.candidates("apply", apply_button_selectors)
+        selector, _ = await self._race("apply", apply_button_selectors)
+        if selector:
+            self._log(f"Found apply button with selector: {selector}")
+            self.selector_cache.record(self._domain(), "apply", selector)
+            return selector
 
         self._log("Could not find apply button", "warning")
         return None
 
-    async def fill_form(self, resume_data):
+    async def fill_form(self, resume_data, fill_plan: Optional[FillPlan] = None):
         """
         Fill out the job application form using resume data.
-        This is a simplified implementation that would need to be expanded
-        for real-world use.
+        All fields are discovered in one page round trip, matched against
+        the resume's fill plan in Python and filled in a single batch.
+        The plan is compiled from the resume data when not given.
         """
         self._log("Filling out application form")
 
-        # Common form field selectors and their corresponding resume data
-        form_fields = {
-            "input[name*='name' i], input[placeholder*='name' i]": resume_data.name,
-            "input[name*='email' i], input[placeholder*='email' i]": resume_data.contact_info.get(
-                "email"
-            ),
-            "input[name*='phone' i], input[placeholder*='phone' i]": resume_data.contact_info.get(
-                "phone", ""
-            ),
-            "textarea[name*='summary' i], textarea[placeholder*='summary' i], textarea[name*='about' i]": resume_data.summary,
-        }
-
-        for selector, value in form_fields.items():
-            if value:
-                try:
-                    field = await self.page.wait_for_selector(selector, timeout=1000)
-                    if field:
-                        await field.fill(value)
-                        self._log(f"Filled field {selector} with value")
-                except Exception as e:
-                    self._log(f"Error filling field {selector}: {str(e)}", "warning")
+        try:
+            if fill_plan is None:
+                if isinstance(resume_data, dict):
+                    resume_data = ResumeData(**resume_data)
+                fill_plan = compile_fill_plan(resume_data)
+
+            fields = await discover_fields(self.page)
+            self._log(f"Discovered {len(fields)} form fields")
+
+            fills = plan_fills(fields, fill_plan)
+            filled = await apply_fills(self.page, fills)
+            for fill in fills:
+                if fill["index"] in filled:
+                    self._log(f"Filled field {fill['key']} with value")
+        except Exception as e:
+            self._log(f"Error filling form: {str(e)}", "warning")
 
         self._log("Form filling completed")
 
@@ -151,15 +217,23 @@ class JobApplier:
             "input[name*='cv' i]",
         ]
 
-        for selector in file_input_selectors:
+        file_input_selectors = self.board.candidates("upload", file_input_selectors)
+
+        # File inputs are often hidden behind styled buttons
+        while file_input_selectors:
+            selector, file_input = await self._race(
+                "upload", file_input_selectors, state="attached"
+            )
+            if not selector:
+                break
             try:
-                file_input = await self.page.wait_for_selector(selector, timeout=1000)
-                if file_input:
-                    await file_input.set_input_files(resume_path)
-                    self._log(f"Uploaded resume using selector: {selector}")
-                    return True
+                await file_input.set_input_files(resume_path)
+                self._log(f"Uploaded resume using selector: {selector}")
+                self.selector_cache.record(self._domain(), "upload", selector)
+                return True
             except Exception as e:
                 self._log(f"Error with file input {selector}: {str(e)}", "debug")
+                file_input_selectors.remove(selector)
 
         self._log("Could not find file input for resume upload", "warning")
         return False
@@ -180,100 +254,146 @@ class JobApplier:
             "button.apply",
         ]
 
-        for selector in submit_button_selectors:
-            try:
-                button = await self.page.wait_for_selector(selector, timeout=1000)
-                if button:
+        submit_button_selectors = self.board.candidates("submit", submit_button_selectors)
+        while submit_button_selectors:
+            with self.spans.span("submit"):
+                selector, button = await self._race("submit", submit_button_selectors)
+                if not selector:
+                    break
+                try:
+                    domain = self._domain()
+                    previous_url = self.page.url
                     await button.click()
                     self._log(f"Clicked submit button with selector: {selector}")
+                    self.selector_cache.record(domain, "submit", selector)
+                except Exception as e:
+                    self._log(f"Error with submit button {selector}: {str(e)}", "debug")
+                    submit_button_selectors.remove(selector)
+                    continue
 
-                    # Wait for submission to complete
-                    await self.page.wait_for_load_state("networkidle")
-                    self._log("Application submitted successfully")
-                    return True
-            except Exception as e:
-                self._log(f"Error with submit button {selector}: {str(e)}", "debug")
+            # Wait for submission to complete
+            with self.spans.span("post_submit_wait"):
+                await self.wait_ready("after_submit", previous_url)
+            self._log("Application submitted successfully")
+            return True
 
         self._log("Could not find submit button", "warning")
         return False
 
+    async def click_step(self, step: str) -> bool:
+        """
+        Click the job board's control for a board specific step, such as
+        moving to the next page of a multi-page form.
+        Returns False when the control is not on the page.
+        """
+        selectors = self.board.selectors.get(step, [])
+        if not selectors:
+            return False
+        selector, button = await self._race(step, selectors)
+        if not selector:
+            self._log(f"No control for step {step}, skipping", "debug")
+            return False
+
+        domain = self._domain()
+        previous_url = self.page.url
+        await button.click()
+        self._log(f"Clicked {step} control with selector: {selector}")
+        self.selector_cache.record(domain, step, selector)
+        await self.wait_ready(f"after_{step}", previous_url)
+        return True
+
     async def detect_job_board(self, url: str) -> str:
         """
-        Detect which job board the URL belongs to.
+        Detect which job board the URL belongs to and select its adapter.
         Returns the name of the job board.
         """
-        domain = urlparse(url).netloc.lower()
-
-        if "linkedin.com" in domain:
-            return "linkedin"
-        elif "indeed.com" in domain:
-            return "indeed"
-        elif "glassdoor.com" in domain:
-            return "glassdoor"
-        elif "monster.com" in domain:
-            return "monster"
-        elif "ziprecruiter.com" in domain:
-            return "ziprecruiter"
-        else:
-            return "unknown"
-
-    async def apply_to_job(self, job_url: str, resume_path: str, resume_data):
+        self.board = self.board_registry.lookup(url)
+        return self.board.name
+
+    async def apply_to_job(
+        self,
+        job_url: str,
+        resume_path: str,
+        resume_data,
+        fill_plan: Optional[FillPlan] = None,
+    ):
         """
-        Apply to a job using the provided resume.
+        Apply to a job using the provided resume, running the steps of
+        the job board's adapter in order.
         """
         try:
-            # Start the browser if not already started
-            if not self.browser:
+            # Lease a browser context if not already leased
+            if not self.lease:
                 await self.start()
 
-            # Navigate to the job posting
-            await self.navigate(job_url)
-
             # Detect job board
-            job_board = await self.detect_job_board(job_url)
-            self._log(f"Detected job board: {job_board}")
-
-            # Find and click the apply button
-            apply_button = await self.find_apply_button()
-            if apply_button:
-                await self.page.click(apply_button)
-                self._log("Clicked apply button")
-
-                # Wait for the application form to load
-                await self.page.wait_for_load_state("networkidle")
-
-                # Upload resume
-                resume_uploaded = await self.upload_resume(resume_path)
-
-                # Fill out the form
-                await self.fill_form(resume_data)
+            with self.spans.span("board_detection"):
+                self.job_board = await self.detect_job_board(job_url)
+            self._log(f"Detected job board: {self.job_board}")
 
-                # Submit the application
-                submitted = await self.submit_application()
-
-                if submitted:
-                    self._log("Job application completed successfully")
-                    return True, self.logs
+            # Navigate to the job posting
+            with self.spans.span("navigate"):
+                await self.navigate(job_url)
+
+            for step in self.board.steps:
+                if step == "apply":
+                    # Find and click the apply button
+                    with self.spans.span("apply_search"):
+                        apply_button = await self.find_apply_button()
+                    if not apply_button:
+                        self._log("Could not find apply button", "error")
+                        return False, self.logs
+                    with self.spans.span("open_form"):
+                        previous_url = self.page.url
+                        await self.page.click(apply_button)
+                        self._log("Clicked apply button")
+
+                        # Wait for the application form to load
+                        await self.wait_ready("after_apply", previous_url)
+                elif step == "upload":
+                    with self.spans.span("upload"):
+                        await self.upload_resume(resume_path)
+                elif step == "fill":
+                    with self.spans.span("fill"):
+                        await self.fill_form(resume_data, fill_plan)
+                elif step == "submit":
+                    if not await self.submit_application():
+                        self._log("Failed to submit application", "error")
+                        return False, self.logs
                 else:
-                    self._log("Failed to submit application", "error")
-                    return False, self.logs
-            else:
-                self._log("Could not find apply button", "error")
-                return False, self.logs
+                    with self.spans.span(step):
+                        await self.click_step(step)
+
+            self._log("Job application completed successfully")
+            return True, self.logs
 
         except Exception as e:
             self._log(f"Error applying to job: {str(e)}", "error")
             return False, self.logs
         finally:
-            # Close the browser
+            # Report what the request blocking saved
+            if self.blocker and self.network_profile.enabled:
+                self._log(self.blocker.summary())
+
+            # Return the browser context to the pool
             await self.close()
 
 
 # Example usage
-async def apply_to_job_url(job_url: str, resume_path: str, resume_data):
+async def apply_to_job_url(
+    job_url: str,
+    resume_path: str,
+    resume_data,
+    log_sink: Optional[Callable[[LogRecord], None]] = None,
+    fill_plan: Optional[FillPlan] = None,
+    spans: Optional[SpanRecorder] = None,
+):
     """
     Apply to a job at the given URL using the provided resume.
+    Log records are passed to `log_sink` as they are produced. A
+    precompiled `fill_plan` is used instead of compiling one from
+    `resume_data`. Stage timings are added to `spans`.
     """
-    async with JobApplier(headless=False) as applier:
-        success, logs = await applier.apply_to_job(job_url, resume_path, resume_data)
+    async with JobApplier(log_sink=log_sink, spans=spans) as applier:
+        success, logs = await applier.apply_to_job(job_url, resume_path, resume_data, fill_plan)
         return success, logs
@@ -0,0 +1,271 @@
+from playwright.async_api import Page
+from typing import Any, Dict, List, Optional
+
+from models import FillPlan, FillRule
+
+# Attribute used to address discovered fields in the batch fill
+FIELD_ATTRIBUTE = "data-dja-field"
+
+# Collect every fillable control with the text that describes it
+DISCOVER_FIELDS_JS = """
+(attr) => {
+    const skipTypes = ["hidden", "submit", "button", "reset", "image"];
+    const text = (el) => (el ? el.textContent.trim().replace(/\\s+/g, " ") : "");
+    const labelFor = (el) => {
+        if (el.labels && el.labels.length) {
+            return Array.from(el.labels).map(text).join(" ");
+        }
+        const wrapping = el.closest("label");
+        return wrapping ? text(wrapping) : "";
+    };
+    const labelledBy = (el) => {
+        const ids = (el.getAttribute("aria-labelledby") || "").split(/\\s+/);
+        return ids.filter(Boolean).map((id) => text(document.getElementById(id))).join(" ");
+    };
+    const fields = [];
+    document.querySelectorAll("input, textarea, select").forEach((el) => {
+        const type = (el.getAttribute("type") || "").toLowerCase();
+        if (el.tagName === "INPUT" && skipTypes.includes(type)) {
+            return;
+        }
+        const index = fields.length;
+        el.setAttribute(attr, String(index));
+        fields.push({
+            index: index,
+            tag: el.tagName.toLowerCase(),
+            type: type,
+            name: el.getAttribute("name") || "",
+            id: el.id || "",
+            placeholder: el.getAttribute("placeholder") || "",
+            label: labelFor(el),
+            aria_label: el.getAttribute("aria-label") || "",
+            aria_labelledby: labelledBy(el),
+            autocomplete: el.getAttribute("autocomplete") || "",
+            disabled: el.disabled || el.readOnly || false,
+            has_value: !!el.value,
+        });
+    });
+    return fields;
+}
+"""
+
+# Apply every fill in one round trip, firing the events frameworks listen for
+FILL_FIELDS_JS = """
+([attr, fills]) => {
+    const filled = [];
+    for (const fill of fills) {
+        const el = document.querySelector(`[${attr}="${fill.index}"]`);
+        if (!el) {
+            continue;
+        }
+        if (el.tagName === "SELECT") {
+            const wanted = String(fill.value).toLowerCase();
+            const option = Array.from(el.options).find(
+                (o) => o.value.toLowerCase() === wanted || o.text.trim().toLowerCase() === wanted
+            ) || Array.from(el.options).find(
+                (o) => o.text.trim().toLowerCase().includes(wanted)
+            );
+            if (!option) {
+                continue;
+            }
+            el.value = option.value;
+        } else {
+            const proto = el.tagName === "TEXTAREA"
+                ? HTMLTextAreaElement.prototype
+                : HTMLInputElement.prototype;
+            Object.getOwnPropertyDescriptor(proto, "value").set.call(el, String(fill.value));
+        }
+        el.dispatchEvent(new Event("input", { bubbles: true }));
+        el.dispatchEvent(new Event("change", { bubbles: true }));
+        filled.push(fill.index);
+    }
+    return filled;
+}
+"""
+
+# Field keys in match priority order: keywords found in the field's
+# describing text, autocomplete tokens and the tags the key may fill
+FIELD_MATCHERS = [
+    ("email", ["email", "e mail"], ["email"], ["input"]),
+    ("first_name", ["first name", "firstname", "given name"], ["given-name"], ["input"]),
+    ("last_name", ["last name", "lastname", "family name", "surname"], ["family-name"], ["input"]),
+    ("phone", ["phone", "mobile", "telephone"], ["tel"], ["input"]),
+    ("linkedin", ["linkedin"], [], ["input"]),
+    ("github", ["github"], [], ["input"]),
+    ("website", ["website", "portfolio", "personal site"], ["url"], ["input"]),
+    ("name", ["full name", "fullname", "your name", "name"], ["name"], ["input"]),
+    ("summary", ["summary", "about", "cover letter", "additional information"], [], ["textarea"]),
+]
+
+# Keys whose fields a broader key's selector must not also match, since
+# `name` keywords appear in first and last name attributes too
+SELECTOR_EXCLUSIONS = {"name": ("first_name", "last_name")}
+
+# Tags custom fields may fill
+CUSTOM_FIELD_TAGS = ("input", "textarea", "select")
+
+# Attributes matched by the automation service selectors
+SELECTOR_ATTRIBUTES = ("name", "id", "placeholder", "aria-label")
+
+
+async def discover_fields(page: Page) -> List[Dict[str, Any]]:
+    """
+    Collect every input, textarea and select on the page in a single
+    round trip. Each field is tagged so it can be addressed by its index.
+    """
+    return await page.evaluate(DISCOVER_FIELDS_JS, FIELD_ATTRIBUTE)
+
+
+async def apply_fills(page: Page, fills: List[Dict[str, Any]]) -> List[int]:
+    """
+    Fill all matched fields in a single round trip.
+    Returns the indexes of the fields that were filled.
+    """
+    if not fills:
+        return []
+    return await page.evaluate(FILL_FIELDS_JS, [FIELD_ATTRIBUTE, fills])
+
+
+def field_values(resume_data) -> Dict[str, str]:
+    """
+    Build the values for each field key from resume data.
+    """
+    contact_info = resume_data.contact_info or {}
+    portfolio = resume_data.portfolio or {}
+    name_parts = resume_data.name.split()
+
+    values = {
+        "name": resume_data.name,
+        "first_name": name_parts[0] if name_parts else "",
+        "last_name": " ".join(name_parts[1:]),
+        "email": contact_info.get("email", ""),
+        "phone": contact_info.get("phone", ""),
+        "linkedin": contact_info.get("linkedin") or portfolio.get("linkedin", ""),
+        "github": contact_info.get("github") or portfolio.get("github", ""),
+        "website": contact_info.get("website") or portfolio.get("website", ""),
+        "summary": resume_data.summary,
+    }
+    return {key: value for key, value in values.items() if value}
+
+
+def _normalize_key(key: str) -> str:
+    return key.replace("_", " ").replace("-", " ").lower()
+
+
+def describe_field(field: Dict[str, Any]) -> str:
+    """Lower-cased text that describes a discovered field."""
+    parts = [
+        field.get("name", ""),
+        field.get("id", ""),
+        field.get("placeholder", ""),
+        field.get("label", ""),
+        field.get("aria_label", ""),
+        field.get("aria_labelledby", ""),
+    ]
+    return _normalize_key(" ".join(parts))
+
+
+def _attribute_selectors(tag: str, keywords, autocomplete) -> List[str]:
+    """Attribute selectors for keywords and autocomplete tokens, without duplicates."""
+    parts = []
+    for token in autocomplete:
+        parts.append(f"{tag}[autocomplete~='{token}' i]")
+    for keyword in keywords:
+        # Attributes spell multi-word keywords as one word or with underscores
+        for variant in (keyword, keyword.replace(" ", ""), keyword.replace(" ", "_")):
+            variant = variant.replace("'", "\\'")
+            for attribute in SELECTOR_ATTRIBUTES:
+                parts.append(f"{tag}[{attribute}*='{variant}' i]")
+    return list(dict.fromkeys(parts))
+
+
+def _rule_selector(rule: FillRule) -> str:
+    """
+    CSS selector matching the fields a rule describes, for clients that
+    match by selector rather than by discovered field descriptions.
+    Fields of the keys in SELECTOR_EXCLUSIONS are left out.
+    """
+    excluded = [
+        (keywords, autocomplete)
+        for key, keywords, autocomplete, _ in FIELD_MATCHERS
+        if key in SELECTOR_EXCLUSIONS.get(rule.key, ())
+    ]
+    exclusion = ", ".join(
+        selector
+        for keywords, autocomplete in excluded
+        for selector in _attribute_selectors("", keywords, autocomplete)
+    )
+    parts = []
+    for tag in rule.tags:
+        for selector in _attribute_selectors(tag, rule.keywords, rule.autocomplete):
+            parts.append(f"{selector}:not({exclusion})" if exclusion else selector)
+    return ", ".join(parts)
+
+
+def compile_fill_plan(resume_data) -> FillPlan:
+    """
+    Compile resume data into an immutable fill plan: one rule per known
+    field key that has a value, in match priority order, followed by the
+    resume's custom fields. Compiled once per resume and reused for every
+    application.
+    """
+    values = field_values(resume_data)
+    rules = [
+        FillRule(
+            key=key,
+            value=values[key],
+            keywords=tuple(keywords),
+            autocomplete=tuple(autocomplete_tokens),
+            tags=tuple(tags),
+        )
+        for key, keywords, autocomplete_tokens, tags in FIELD_MATCHERS
+        if key in values
+    ]
+    for custom_key, custom_value in (resume_data.custom_fields or {}).items():
+        if custom_value is not None:
+            rules.append(
+                FillRule(
+                    key=custom_key,
+                    value=str(custom_value),
+                    keywords=(_normalize_key(custom_key),),
+                    tags=CUSTOM_FIELD_TAGS,
+                )
+            )
+    return FillPlan(
+        rules=tuple(rules),
+        selectors={_rule_selector(rule): rule.value for rule in rules},
+    )
+
+
+def match_field(field: Dict[str, Any], plan: FillPlan) -> Optional[FillRule]:
+    """
+    Return the rule a discovered field should be filled by,
+    or None if it does not correspond to any value in the plan.
+    """
+    if field.get("type") == "file" or field.get("disabled"):
+        return None
+
+    description = describe_field(field)
+    autocomplete = field.get("autocomplete", "").lower().split()
+    for rule in plan.rules:
+        if field.get("tag") not in rule.tags:
+            continue
+        if field.get("type") == "email" and rule.key == "email":
+            return rule
+        if any(token in autocomplete for token in rule.autocomplete):
+            return rule
+        if any(keyword in description for keyword in rule.keywords):
+            return rule
+    return None
+
+
+def plan_fills(fields: List[Dict[str, Any]], plan: FillPlan) -> List[Dict[str, Any]]:
+    """
+    Match discovered fields against a resume's fill plan.
+    """
+    fills = []
+    for field in fields:
+        rule = match_field(field, plan)
+        if rule:
+            fills.append({"index": field["index"], "key": rule.key, "value": rule.value})
+    return fills
@@ -0,0 +1,176 @@
+from playwright.async_api import BrowserContext, Route
+import os
+from typing import Callable, Dict, List, Optional
+from urllib.parse import urlparse
+
+# Resource types aborted by default
+BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+
+# Analytics and advertising hosts, matched by domain suffix
+TRACKER_DOMAINS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googleadservices.com",
+    "facebook.net",
+    "connect.facebook.com",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "fullstory.com",
+    "nr-data.net",
+    "newrelic.com",
+    "optimizely.com",
+    "bat.bing.com",
+    "clarity.ms",
+    "px.ads.linkedin.com",
+    "snap.licdn.com",
+    "scorecardresearch.com",
+    "quantserve.com",
+    "adnxs.com",
+    "tiktok.com/i18n/pixel",
+]
+
+# Hosts that are never blocked, for every board
+DEFAULT_ALLOWLIST = [
+    "recaptcha.net",
+    "gstatic.com",
+    "google.com/recaptcha",
+    "hcaptcha.com",
+    "challenges.cloudflare.com",
+]
+
+# Hosts that are never blocked, per job board
+BOARD_ALLOWLISTS: Dict[str, List[str]] = {
+    "linkedin": ["static.licdn.com", "media.licdn.com"],
+    "indeed": ["indeed.com/m/basecamp"],
+    "glassdoor": ["glassdoor.com/static"],
+}
+
+# Rough average transfer sizes in bytes, used to estimate savings
+ESTIMATED_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "script": 30_000,
+}
+DEFAULT_ESTIMATED_BYTES = 5_000
+
+# Assumed download speed in bytes per second, used to estimate time saved
+ASSUMED_BANDWIDTH = int(os.environ.get("ASSUMED_BANDWIDTH", str(5_000_000)))
+
+
+def _matches(host: str, host_path: str, patterns: List[str]) -> bool:
+    """Match a request against host suffixes or host/path prefixes."""
+    for pattern in patterns:
+        if "/" in pattern:
+            if host_path.startswith(pattern) or f".{pattern}" in host_path:
+                return True
+        elif host == pattern or host.endswith(f".{pattern}"):
+            return True
+    return False
+
+
+class NetworkProfile:
+    """
+    Request interception settings for automation contexts.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        blocked_resource_types: Optional[List[str]] = None,
+        blocked_domains: Optional[List[str]] = None,
+        allowlist: Optional[List[str]] = None,
+        board_allowlists: Optional[Dict[str, List[str]]] = None,
+    ):
+        self.enabled = enabled
+        self.blocked_resource_types = set(
+            BLOCKED_RESOURCE_TYPES if blocked_resource_types is None else blocked_resource_types
+        )
+        self.blocked_domains = TRACKER_DOMAINS if blocked_domains is None else blocked_domains
+        self.allowlist = DEFAULT_ALLOWLIST if allowlist is None else allowlist
+        self.board_allowlists = BOARD_ALLOWLISTS if board_allowlists is None else board_allowlists
+
+    @classmethod
+    def from_env(cls) -> "NetworkProfile":
+        """
+        Build a profile from BLOCK_NETWORK (set to "false" to disable) and
+        BLOCK_RESOURCE_TYPES (comma separated resource types).
+        """
+        enabled = os.environ.get("BLOCK_NETWORK", "true").lower() != "false"
+        resource_types = os.environ.get("BLOCK_RESOURCE_TYPES")
+        return cls(
+            enabled=enabled,
+            blocked_resource_types=(
+                [t.strip() for t in resource_types.split(",") if t.strip()]
+                if resource_types is not None
+                else None
+            ),
+        )
+
+    def block_reason(self, url: str, resource_type: str, board: str) -> Optional[str]:
+        """
+        Return why a request should be aborted, or None to let it through.
+        """
+        parsed = urlparse(url)
+        host = parsed.netloc.lower()
+        host_path = f"{host}{parsed.path}"
+        if _matches(host, host_path, self.allowlist):
+            return None
+        if _matches(host, host_path, self.board_allowlists.get(board, [])):
+            return None
+        if _matches(host, host_path, self.blocked_domains):
+            return "tracker"
+        if resource_type in self.blocked_resource_types:
+            return resource_type
+        return None
+
+
+class RequestBlocker:
+    """
+    Aborts requests matching a NetworkProfile on a browser context and
+    keeps counts of what was blocked.
+    """
+
+    def __init__(self, profile: NetworkProfile, board: Callable[[], str]):
+        self.profile = profile
+        self.board = board
+        self.blocked: Dict[str, int] = {}
+        self.allowed = 0
+        self.estimated_bytes = 0
+
+    async def install(self, context: BrowserContext):
+        """Route every request on the context through the profile."""
+        if self.profile.enabled:
+            await context.route("**/*", self._handle)
+
+    async def _handle(self, route: Route):
+        request = route.request
+        reason = self.profile.block_reason(request.url, request.resource_type, self.board())
+        if reason is None:
+            self.allowed += 1
+            await route.continue_()
+            return
+
+        self.blocked[reason] = self.blocked.get(reason, 0) + 1
+        self.estimated_bytes += ESTIMATED_BYTES.get(
+            request.resource_type, DEFAULT_ESTIMATED_BYTES
+        )
+        await route.abort("blockedbyclient")
+
+    @property
+    def estimated_seconds(self) -> float:
+        return self.estimated_bytes / ASSUMED_BANDWIDTH
+
+    def summary(self) -> str:
+        """One-line report of blocked requests and estimated savings."""
+        total = sum(self.blocked.values())
+        by_reason = ", ".join(f"{reason}: {count}" for reason, count in sorted(self.blocked.items()))
+        return (
+            f"Blocked {total} of {total + self.allowed} requests"
+            + (f" ({by_reason})" if by_reason else "")
+            + f", saved ~{self.estimated_bytes / 1024:.0f} KB"
+            + f" and ~{self.estimated_seconds:.2f}s (estimated)"
+        )
@@ -0,0 +1,220 @@
+from playwright.async_api import async_playwright, Browser, BrowserContext
+import asyncio
+import logging
+import os
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pool settings
+BROWSER_POOL_SIZE = int(os.environ.get("BROWSER_POOL_SIZE", "2"))
+BROWSER_MAX_CONTEXTS = int(os.environ.get("BROWSER_MAX_CONTEXTS", "50"))
+BROWSER_HEADLESS = os.environ.get("BROWSER_HEADLESS", "true").lower() != "false"
+
+
+class BrowserSlot:
+    """
+    A single warm Chromium instance owned by the pool.
+    """
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser: Optional[Browser] = None
+        self.contexts_served = 0
+
+    def is_healthy(self) -> bool:
+        """Check that the browser process is still connected."""
+        return self.browser is not None and self.browser.is_connected()
+
+
+class BrowserLease:
+    """
+    An isolated browser context leased from a pooled browser.
+    """
+
+    def __init__(self, slot: BrowserSlot, context: BrowserContext):
+        self.slot = slot
+        self.context = context
+
+
+class BrowserPool:
+    """
+    Process-wide pool of warm Chromium browsers.
+
+    Each lease gets a fresh BrowserContext (own cookies, storage and cache)
+    on an already running browser. Contexts are closed when returned, and
+    browsers are relaunched when they disconnect or after serving
+    `max_contexts` contexts, which bounds memory growth in long-lived
+    Chromium processes.
+    """
+
+    def __init__(
+        self,
+        size: int = BROWSER_POOL_SIZE,
+        headless: bool = BROWSER_HEADLESS,
+        max_contexts: int = BROWSER_MAX_CONTEXTS,
+    ):
+        self.size = max(1, size)
+        self.headless = headless
+        self.max_contexts = max_contexts
+        self.playwright = None
+        self.slots: List[BrowserSlot] = []
+        self._available: Optional[asyncio.Queue] = None
+        self._start_lock = asyncio.Lock()
+        self._started = False
+        self._leased = 0
+        self._launches = 0
+        self._recycled = 0
+
+    async def start(self):
+        """Start Playwright and launch the pooled browsers."""
+        async with self._start_lock:
+            if self._started:
+                return
+            self.playwright = await async_playwright().start()
+            self._available = asyncio.Queue()
+            try:
+                for index in range(self.size):
+                    slot = BrowserSlot(index)
+                    await self._launch(slot)
+                    self.slots.append(slot)
+                    self._available.put_nowait(slot)
+            except Exception:
+                # Do not leave Playwright or half the browsers running
+                for slot in self.slots:
+                    await self._shutdown_browser(slot)
+                self.slots = []
+                self._available = None
+                await self.playwright.stop()
+                self.playwright = None
+                raise
+            self._started = True
+            logger.info(f"Browser pool started with {self.size} browser(s)")
+
+    async def close(self):
+        """Close every pooled browser and stop Playwright."""
+        async with self._start_lock:
+            if not self._started:
+                return
+            for slot in self.slots:
+                await self._shutdown_browser(slot)
+            self.slots = []
+            self._available = None
+            if self.playwright:
+                await self.playwright.stop()
+                self.playwright = None
+            self._started = False
+            logger.info("Browser pool closed")
+
+    async def acquire(self) -> BrowserLease:
+        """
+        Lease an isolated browser context.
+        Waits until a pooled browser is free.
+        """
+        if not self._started:
+            await self.start()
+
+        slot = await self._available.get()
+        try:
+            if not slot.is_healthy():
+                logger.warning(f"Browser {slot.index} is unhealthy, relaunching")
+                await self._relaunch(slot)
+            elif slot.contexts_served >= self.max_contexts:
+                logger.info(
+                    f"Browser {slot.index} served {slot.contexts_served} contexts, recycling"
+                )
+                self._recycled += 1
+                await self._relaunch(slot)
+
+            context = await slot.browser.new_context()
+        except Exception:
+            self._available.put_nowait(slot)
+            raise
+
+        slot.contexts_served += 1
+        self._leased += 1
+        return BrowserLease(slot, context)
+
+    async def release(self, lease: BrowserLease):
+        """Close the leased context and return its browser to the pool."""
+        try:
+            await lease.context.close()
+        except Exception as e:
+            logger.warning(f"Error closing browser context: {str(e)}")
+        finally:
+            self._leased -= 1
+            if self._available is not None:
+                self._available.put_nowait(lease.slot)
+
+    @asynccontextmanager
+    async def lease(self):
+        """Lease a browser context for the duration of a `with` block."""
+        lease = await self.acquire()
+        try:
+            yield lease.context
+        finally:
+            await self.release(lease)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool usage counters."""
+        return {
+            "size": self.size,
+            "started": self._started,
+            "leased": self._leased,
+            "available": self._available.qsize() if self._available else 0,
+            "launches": self._launches,
+            "recycled": self._recycled,
+            "contexts_served": [slot.contexts_served for slot in self.slots],
+        }
+
+    async def _launch(self, slot: BrowserSlot):
+        slot.browser = await self.playwright.chromium.launch(headless=self.headless)
+        slot.contexts_served = 0
+        self._launches += 1
+
+    async def _relaunch(self, slot: BrowserSlot):
+        await self._shutdown_browser(slot)
+        await self._launch(slot)
+
+    async def _shutdown_browser(self, slot: BrowserSlot):
+        if slot.browser is None:
+            return
+        try:
+            await slot.browser.close()
+        except Exception as e:
+            logger.warning(f"Error closing browser {slot.index}: {str(e)}")
+        slot.browser = None
+
+
+# Singleton instance
+browser_pool = None
+
+
+def get_browser_pool(headless: bool = BROWSER_HEADLESS) -> BrowserPool:
+    """
+    Get or create the process-wide BrowserPool instance.
+    """
+    global browser_pool
+    if browser_pool is None:
+        browser_pool = BrowserPool(headless=headless)
+    return browser_pool
+
+
+def browser_pool_stats() -> Optional[Dict[str, Any]]:
+    """
+    Return usage counters for the process-wide BrowserPool, if created.
+    """
+    return browser_pool.stats() if browser_pool is not None else None
+
+
+async def shutdown_browser_pool():
+    """
+    Close the process-wide BrowserPool if it was started.
+    """
+    global browser_pool
+    if browser_pool is not None:
+        await browser_pool.close()
+        browser_pool = None
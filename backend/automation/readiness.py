@@ -0,0 +1,150 @@
+from playwright.async_api import Page
+import asyncio
+import os
+from typing import Dict, List, Optional
+
+# Time budget for readiness conditions, in milliseconds
+READINESS_TIMEOUT_MS = int(os.environ.get("READINESS_TIMEOUT_MS", "10000"))
+
+# Fallback quiescence window: no new network activity for QUIET_MS,
+# waiting at most QUIET_MAX_MS
+QUIET_MS = 500
+QUIET_MAX_MS = 3000
+
+
+class ReadinessCondition:
+    """
+    A condition that signals a page is ready for the next step:
+    a selector being attached, the URL changing from the one seen
+    before the triggering action and the new page's DOM loading, or
+    the page settling: loaded, then no network activity for QUIET_MS.
+    A page still busy after QUIET_MAX_MS never settles.
+    """
+
+    def __init__(
+        self,
+        description: str,
+        selector: Optional[str] = None,
+        url_change: bool = False,
+        settled: bool = False,
+    ):
+        self.description = description
+        self.selector = selector
+        self.url_change = url_change
+        self.settled = settled
+
+    async def wait(self, page: Page, previous_url: Optional[str], timeout: int):
+        if self.selector:
+            await page.wait_for_selector(self.selector, state="attached", timeout=timeout)
+        elif self.url_change and previous_url:
+            await page.wait_for_url(
+                lambda url: url != previous_url, wait_until="commit", timeout=timeout
+            )
+            await page.wait_for_load_state("domcontentloaded", timeout=timeout)
+        elif self.settled:
+            # Requests made while the page loaded are over by "load"
+            await page.wait_for_load_state("load", timeout=timeout)
+            if not await wait_for_quiescence(page, max_ms=min(QUIET_MAX_MS, timeout)):
+                raise TimeoutError(self.description)
+        else:
+            # Nothing to wait for, never satisfied
+            await asyncio.sleep(timeout / 1000)
+            raise TimeoutError(self.description)
+
+
+# Lets pages with no expected element, such as closed postings, through
+# once they settle instead of after the full timeout
+PAGE_SETTLED = ReadinessCondition("page settled", settled=True)
+
+# Conditions per stage used when a board adapter has none of its own
+DEFAULT_READINESS: Dict[str, List[ReadinessCondition]] = {
+    "navigate": [
+        ReadinessCondition(
+            "apply control present",
+            selector="button:has-text('Apply'), a:has-text('Apply'), [aria-label*='apply' i]",
+        ),
+        ReadinessCondition("form present", selector="form"),
+        PAGE_SETTLED,
+    ],
+    "after_apply": [
+        ReadinessCondition("file input present", selector="input[type='file']"),
+        ReadinessCondition("form present", selector="form"),
+        ReadinessCondition("url changed", url_change=True),
+    ],
+    "after_submit": [
+        ReadinessCondition("url changed", url_change=True),
+        ReadinessCondition(
+            "confirmation shown",
+            selector="text=/thank you|application (was )?(submitted|received)/i",
+        ),
+    ],
+}
+
+
+async def wait_for_quiescence(
+    page: Page, quiet_ms: int = QUIET_MS, max_ms: int = QUIET_MAX_MS
+) -> bool:
+    """
+    Wait until no request has started or finished for `quiet_ms`,
+    giving up after `max_ms`. Unlike networkidle this tolerates pages
+    that keep a long-polling connection or analytics beacon open.
+    Returns whether the page went quiet before giving up.
+    """
+    loop = asyncio.get_running_loop()
+    last_activity = loop.time()
+    deadline = last_activity + max_ms / 1000
+
+    def on_activity(_):
+        nonlocal last_activity
+        last_activity = loop.time()
+
+    events = ["request", "requestfinished", "requestfailed"]
+    for event in events:
+        page.on(event, on_activity)
+    try:
+        while True:
+            now = loop.time()
+            quiet_until = last_activity + quiet_ms / 1000
+            if now >= quiet_until:
+                return True
+            if now >= deadline:
+                return False
+            await asyncio.sleep(min(quiet_until, deadline) - now)
+    finally:
+        for event in events:
+            page.remove_listener(event, on_activity)
+
+
+async def wait_until_ready(
+    page: Page,
+    conditions: List[ReadinessCondition],
+    previous_url: Optional[str] = None,
+    timeout: int = READINESS_TIMEOUT_MS,
+) -> str:
+    """
+    Wait for the first readiness condition to be satisfied.
+    Falls back to domcontentloaded plus a short quiescence window when
+    none is met in time. Returns a description of what made the page
+    ready.
+    """
+    tasks = {
+        asyncio.create_task(condition.wait(page, previous_url, timeout)): condition
+        for condition in conditions
+    }
+    pending = set(tasks)
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return tasks[task].description
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    await page.wait_for_load_state("domcontentloaded")
+    await wait_for_quiescence(page)
+    return "domcontentloaded and network quiet"
@@ -0,0 +1,170 @@
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Cache settings
+SELECTOR_CACHE_PATH = os.environ.get(
+    "SELECTOR_CACHE_PATH", os.path.join(os.getcwd(), "selector_cache.json")
+)
+SELECTOR_CACHE_MAX_DOMAINS = int(os.environ.get("SELECTOR_CACHE_MAX_DOMAINS", "1000"))
+SELECTOR_CACHE_MAX_PER_STEP = int(os.environ.get("SELECTOR_CACHE_MAX_PER_STEP", "5"))
+# Seconds to gather updates before writing the cache file
+SELECTOR_CACHE_SAVE_DELAY = float(os.environ.get("SELECTOR_CACHE_SAVE_DELAY", "5"))
+
+
+class SelectorCache:
+    """
+    Persistent record of which selector matched for each domain and step.
+
+    Entries are kept as domain -> step -> selector -> {hits, last_hit}.
+    Domains are evicted least recently used first once the cache holds
+    more than `max_domains`, and each step keeps only its most hit
+    selectors. Updates are gathered for `save_delay` seconds and then
+    written to a JSON file in a worker thread.
+    """
+
+    def __init__(
+        self,
+        path: str = SELECTOR_CACHE_PATH,
+        max_domains: int = SELECTOR_CACHE_MAX_DOMAINS,
+        save_delay: float = SELECTOR_CACHE_SAVE_DELAY,
+    ):
+        self.path = path
+        self.max_domains = max_domains
+        self.save_delay = save_delay
+        self._entries: "OrderedDict[str, Dict[str, Dict[str, Dict[str, Any]]]]" = OrderedDict()
+        self._loaded = False
+        self._dirty = False
+        self._save_task: Optional[asyncio.Task] = None
+        self._write_lock = asyncio.Lock()
+
+    def winners(self, domain: str, step: str, selectors: List[str]) -> List[str]:
+        """
+        Return the candidates that previously matched for this domain and
+        step, most hit first.
+        """
+        self._load()
+        hits = self._entries.get(domain, {}).get(step, {})
+        known = [selector for selector in selectors if selector in hits]
+        return sorted(known, key=lambda selector: -hits[selector]["hits"])
+
+    def record(self, domain: str, step: str, selector: str):
+        """Record that a selector matched for this domain and step."""
+        self._load()
+        steps = self._entries.setdefault(domain, {})
+        hits = steps.setdefault(step, {})
+        entry = hits.setdefault(selector, {"hits": 0, "last_hit": 0.0})
+        entry["hits"] += 1
+        entry["last_hit"] = time.time()
+
+        # Keep only the most hit selectors for the step
+        if len(hits) > SELECTOR_CACHE_MAX_PER_STEP:
+            ranked = sorted(hits, key=lambda s: (hits[s]["hits"], hits[s]["last_hit"]))
+            for stale in ranked[: len(hits) - SELECTOR_CACHE_MAX_PER_STEP]:
+                del hits[stale]
+
+        # Evict least recently used domains
+        self._entries.move_to_end(domain)
+        while len(self._entries) > self.max_domains:
+            self._entries.popitem(last=False)
+
+        self._schedule_save()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size counters."""
+        self._load()
+        return {
+            "domains": len(self._entries),
+            "max_domains": self.max_domains,
+        }
+
+    def save(self):
+        """Write the cache to disk atomically."""
+        self._dirty = False
+        self._write(json.dumps(self._entries))
+
+    async def flush(self):
+        """Write pending updates to disk in a worker thread."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        # Serialized here, as the entries only change on the event loop
+        data = json.dumps(self._entries)
+        async with self._write_lock:
+            await asyncio.to_thread(self._write, data)
+
+    async def close(self):
+        """Cancel the pending delayed write and write pending updates now."""
+        if self._save_task is not None and not self._save_task.done():
+            self._save_task.cancel()
+        await self.flush()
+
+    def _schedule_save(self):
+        self._dirty = True
+        if self._save_task is not None and not self._save_task.done():
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No event loop to defer to
+            self.save()
+            return
+        self._save_task = loop.create_task(self._save_later())
+
+    async def _save_later(self):
+        await asyncio.sleep(self.save_delay)
+        await self.flush()
+
+    def _write(self, data: str):
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                f.write(data)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not save selector cache: {str(e)}")
+
+    def _load(self):
+        if self._loaded:
+            return
+        self._loaded = True
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load selector cache: {str(e)}")
+            return
+
+        # Restore recency order from the last hit in each domain
+        def last_hit(steps):
+            return max(
+                (entry["last_hit"] for hits in steps.values() for entry in hits.values()),
+                default=0.0,
+            )
+
+        for domain in sorted(data, key=lambda d: last_hit(data[d])):
+            self._entries[domain] = data[domain]
+
+
+# Singleton instance
+selector_cache = None
+
+
+def get_selector_cache() -> SelectorCache:
+    """
+    Get or create the SelectorCache singleton instance.
+    """
+    global selector_cache
+    if selector_cache is None:
+        selector_cache = SelectorCache()
+    return selector_cache
@@ -0,0 +1,46 @@
+from playwright.async_api import Page, ElementHandle
+import asyncio
+from typing import List, Optional, Tuple
+
+# Default time budget for a whole race, in milliseconds
+SELECTOR_TIMEOUT_MS = 1000
+
+
+async def race_selectors(
+    page: Page,
+    selectors: List[str],
+    timeout: int = SELECTOR_TIMEOUT_MS,
+    state: str = "visible",
+) -> Tuple[Optional[str], Optional[ElementHandle]]:
+    """
+    Wait for all candidate selectors concurrently.
+    Returns the first selector that matches together with its element,
+    or (None, None) if none matched within the timeout. Waits that are
+    still pending when a winner is found are cancelled.
+    """
+    if not selectors:
+        return None, None
+
+    tasks = {
+        asyncio.create_task(
+            page.wait_for_selector(selector, timeout=timeout, state=state)
+        ): selector
+        for selector in selectors
+    }
+    pending = set(tasks)
+
+    try:
+        while pending:
+            done, pending = await asyncio.wait(
+                pending, return_when=asyncio.FIRST_COMPLETED
+            )
+            # Prefer the earliest candidate among waits finishing together
+            for task in sorted(done, key=lambda t: selectors.index(tasks[t])):
+                if task.exception() is None and task.result() is not None:
+                    return tasks[task], task.result()
+        return None, None
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
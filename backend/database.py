@@ -0,0 +1,373 @@
+import base64
+import bisect
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from pydantic import BaseModel
+
+# Storage settings
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "memory")
+DATABASE_PATH = os.getenv("DATABASE_PATH", os.path.join(os.getcwd(), "deep_job_apply.db"))
+
+# Page sizes for list endpoints
+DEFAULT_PAGE_SIZE = int(os.getenv("DEFAULT_PAGE_SIZE", "100"))
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "500"))
+
+# Listing position of a record: (created_at, id)
+PageKey = Tuple[datetime, str]
+
+
+def _status_key(status) -> Optional[str]:
+    """Normalize ApplicationStatus members and plain strings to one key."""
+    return getattr(status, "value", status)
+
+
+def encode_cursor(record: Dict[str, Any]) -> str:
+    """Encode the listing position of a record as an opaque cursor."""
+    raw = f"{record['created_at'].isoformat()}|{record['id']}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> PageKey:
+    """
+    Decode a cursor produced by encode_cursor.
+    Raises ValueError if the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, record_id = raw.split("|", 1)
+        return datetime.fromisoformat(created_at), record_id
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+class Repository:
+    """
+    Storage for records owned by a user, with secondary indexes on
+    user_id, (user_id, status) and created_at.
+
+    Records are dicts in the shape of the repository's pydantic model.
+    `created_at` and `user_id` never change after creation; every other
+    change must go through `update` so the indexes stay current.
+    Listings are ordered by (created_at, id).
+    """
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def create(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def create_many(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        return [self.create(record) for record in records]
+
+    def update(self, record_id: str, **fields) -> Dict[str, Any]:
+        raise NotImplementedError
+
+    def delete(self, record_id: str):
+        raise NotImplementedError
+
+    def list_by_user(self, user_id: str, status=None) -> List[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def page_by_user(
+        self,
+        user_id: str,
+        status=None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[PageKey] = None,
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """
+        List at most `limit` of a user's records positioned strictly after
+        `after` in (created_at, id) order, or before it when descending.
+        """
+        raise NotImplementedError
+
+    def list_by_created(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        """List records created in [start, end) across all users."""
+        raise NotImplementedError
+
+    def count_by_user(self, user_id: str, status=None) -> int:
+        return len(self.list_by_user(user_id, status))
+
+    def __contains__(self, record_id: str) -> bool:
+        return self.get(record_id) is not None
+
+
+class InMemoryRepository(Repository):
+    """
+    Repository kept in process memory.
+    Indexes are sorted lists of (created_at, id), so listings cost
+    O(matching records) rather than O(all records). Records returned by
+    `get` are the stored dicts themselves.
+    """
+
+    def __init__(self):
+        self._records: Dict[str, Dict[str, Any]] = {}
+        self._by_user: Dict[str, List[Tuple[datetime, str]]] = {}
+        self._by_user_status: Dict[Tuple[str, str], List[Tuple[datetime, str]]] = {}
+        self._by_created: List[Tuple[datetime, str]] = []
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        return self._records.get(record_id)
+
+    def create(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        key = (record["created_at"], record["id"])
+        self._records[record["id"]] = record
+        bisect.insort(self._by_user.setdefault(record["user_id"], []), key)
+        bisect.insort(self._by_created, key)
+        if record.get("status") is not None:
+            status_key = (record["user_id"], _status_key(record["status"]))
+            bisect.insort(self._by_user_status.setdefault(status_key, []), key)
+        return record
+
+    def update(self, record_id: str, **fields) -> Dict[str, Any]:
+        record = self._records[record_id]
+        if "status" in fields and _status_key(fields["status"]) != _status_key(record.get("status")):
+            key = (record["created_at"], record_id)
+            if record.get("status") is not None:
+                self._remove(
+                    self._by_user_status, (record["user_id"], _status_key(record["status"])), key
+                )
+            if fields["status"] is not None:
+                status_key = (record["user_id"], _status_key(fields["status"]))
+                bisect.insort(self._by_user_status.setdefault(status_key, []), key)
+        record.update(fields)
+        return record
+
+    def delete(self, record_id: str):
+        record = self._records.pop(record_id)
+        key = (record["created_at"], record_id)
+        self._remove(self._by_user, record["user_id"], key)
+        if record.get("status") is not None:
+            self._remove(
+                self._by_user_status, (record["user_id"], _status_key(record["status"])), key
+            )
+        index = bisect.bisect_left(self._by_created, key)
+        if index < len(self._by_created) and self._by_created[index] == key:
+            del self._by_created[index]
+
+    def list_by_user(self, user_id: str, status=None) -> List[Dict[str, Any]]:
+        if status is None:
+            keys = self._by_user.get(user_id, [])
+        else:
+            keys = self._by_user_status.get((user_id, _status_key(status)), [])
+        return [self._records[record_id] for _, record_id in keys]
+
+    def page_by_user(
+        self,
+        user_id: str,
+        status=None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[PageKey] = None,
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        if status is None:
+            keys = self._by_user.get(user_id, [])
+        else:
+            keys = self._by_user_status.get((user_id, _status_key(status)), [])
+        if descending:
+            high = bisect.bisect_left(keys, after) if after else len(keys)
+            page = reversed(keys[max(0, high - limit):high])
+        else:
+            low = bisect.bisect_right(keys, after) if after else 0
+            page = keys[low:low + limit]
+        return [self._records[record_id] for _, record_id in page]
+
+    def list_by_created(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        low = bisect.bisect_left(self._by_created, (start, "")) if start else 0
+        high = bisect.bisect_left(self._by_created, (end, "")) if end else len(self._by_created)
+        return [self._records[record_id] for _, record_id in self._by_created[low:high]]
+
+    def count_by_user(self, user_id: str, status=None) -> int:
+        if status is None:
+            return len(self._by_user.get(user_id, []))
+        return len(self._by_user_status.get((user_id, _status_key(status)), []))
+
+    @staticmethod
+    def _remove(index: Dict, index_key, key: Tuple[datetime, str]):
+        keys = index.get(index_key)
+        if not keys:
+            return
+        position = bisect.bisect_left(keys, key)
+        if position < len(keys) and keys[position] == key:
+            del keys[position]
+        if not keys:
+            del index[index_key]
+
+
+class SQLiteRepository(Repository):
+    """
+    Repository stored in a SQLite table with one row per record.
+    The indexed fields are stored as columns and the full record as JSON
+    validated through the repository's model. Records returned by `get`
+    are copies, so changes must be saved with `update`.
+    """
+
+    def __init__(self, table: str, model: Type[BaseModel], path: str = DATABASE_PATH):
+        self.table = table
+        self.model = model
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(
+            f"""
+            CREATE TABLE IF NOT EXISTS {table} (
+                id TEXT PRIMARY KEY,
+                user_id TEXT NOT NULL,
+                status TEXT,
+                created_at REAL NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS {table}_user ON {table} (user_id, created_at, id);
+            CREATE INDEX IF NOT EXISTS {table}_user_status
+                ON {table} (user_id, status, created_at, id);
+            CREATE INDEX IF NOT EXISTS {table}_created ON {table} (created_at, id);
+            """
+        )
+
+    def get(self, record_id: str) -> Optional[Dict[str, Any]]:
+        row = self._query(f"SELECT data FROM {self.table} WHERE id = ?", (record_id,))
+        return self._load(row[0][0]) if row else None
+
+    def create(self, record: Dict[str, Any]) -> Dict[str, Any]:
+        return self.create_many([record])[0]
+
+    def create_many(self, records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany(
+                    f"INSERT INTO {self.table} (id, user_id, status, created_at, data) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [self._row(record) for record in records],
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return records
+
+    def update(self, record_id: str, **fields) -> Dict[str, Any]:
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(
+                    f"SELECT data FROM {self.table} WHERE id = ?", (record_id,)
+                ).fetchone()
+                if row is None:
+                    raise KeyError(record_id)
+                record = self._load(row[0])
+                record.update(fields)
+                _, _, status, _, data = self._row(record)
+                self._conn.execute(
+                    f"UPDATE {self.table} SET status = ?, data = ? WHERE id = ?",
+                    (status, data, record_id),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+        return record
+
+    def delete(self, record_id: str):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE id = ?", (record_id,))
+
+    def list_by_user(self, user_id: str, status=None) -> List[Dict[str, Any]]:
+        if status is None:
+            rows = self._query(
+                f"SELECT data FROM {self.table} WHERE user_id = ? ORDER BY created_at, id",
+                (user_id,),
+            )
+        else:
+            rows = self._query(
+                f"SELECT data FROM {self.table} WHERE user_id = ? AND status = ? "
+                "ORDER BY created_at, id",
+                (user_id, _status_key(status)),
+            )
+        return [self._load(row[0]) for row in rows]
+
+    def page_by_user(
+        self,
+        user_id: str,
+        status=None,
+        limit: int = DEFAULT_PAGE_SIZE,
+        after: Optional[PageKey] = None,
+        descending: bool = False,
+    ) -> List[Dict[str, Any]]:
+        conditions = ["user_id = ?"]
+        params: List[Any] = [user_id]
+        if status is not None:
+            conditions.append("status = ?")
+            params.append(_status_key(status))
+        if after is not None:
+            conditions.append(f"(created_at, id) {'<' if descending else '>'} (?, ?)")
+            params.extend([after[0].timestamp(), after[1]])
+        direction = "DESC" if descending else "ASC"
+        rows = self._query(
+            f"SELECT data FROM {self.table} WHERE {' AND '.join(conditions)} "
+            f"ORDER BY created_at {direction}, id {direction} LIMIT ?",
+            (*params, limit),
+        )
+        return [self._load(row[0]) for row in rows]
+
+    def list_by_created(
+        self, start: Optional[datetime] = None, end: Optional[datetime] = None
+    ) -> List[Dict[str, Any]]:
+        rows = self._query(
+            f"SELECT data FROM {self.table} WHERE created_at >= ? AND created_at < ? "
+            "ORDER BY created_at, id",
+            (
+                start.timestamp() if start else float("-inf"),
+                end.timestamp() if end else float("inf"),
+            ),
+        )
+        return [self._load(row[0]) for row in rows]
+
+    def count_by_user(self, user_id: str, status=None) -> int:
+        if status is None:
+            rows = self._query(
+                f"SELECT COUNT(*) FROM {self.table} WHERE user_id = ?", (user_id,)
+            )
+        else:
+            rows = self._query(
+                f"SELECT COUNT(*) FROM {self.table} WHERE user_id = ? AND status = ?",
+                (user_id, _status_key(status)),
+            )
+        return rows[0][0]
+
+    def _query(self, sql: str, params: tuple) -> List[tuple]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _row(self, record: Dict[str, Any]) -> tuple:
+        data = self.model(**record).model_dump_json()
+        return (
+            record["id"],
+            record["user_id"],
+            _status_key(record.get("status")),
+            record["created_at"].timestamp(),
+            data,
+        )
+
+    def _load(self, data: str) -> Dict[str, Any]:
+        return self.model.model_validate_json(data).dict()
+
+
+def get_repository(table: str, model: Type[BaseModel]) -> Repository:
+    """
+    Create the repository for a table using the configured STORAGE_BACKEND.
+    """
+    if STORAGE_BACKEND == "sqlite":
+        return SQLiteRepository(table, model)
+    return InMemoryRepository()
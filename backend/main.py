@@ -4,16 +4,47 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from pydantic import BaseModel
 import uvicorn
 import os
+from contextlib import asynccontextmanager
 from typing import List, Optional
 
 # Import routers
 from routers import users, resumes, jobs
+from automation.pool import browser_pool_stats, shutdown_browser_pool
+from automation.selector_cache import get_selector_cache
+from services.scheduler import get_application_scheduler
+from services.log_store import get_log_store
+from services.resume_parser import get_resume_parser
+from services.preflight import get_preflight_checker
+
+# Seconds to wait for in-flight applications on shutdown
+SHUTDOWN_DRAIN_TIMEOUT = float(os.getenv("SHUTDOWN_DRAIN_TIMEOUT", "60"))
+
+
+# Application lifespan
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    get_application_scheduler().start()
+    yield
+    # Let in-flight applications finish; queued ones stay in the queue
+    await get_application_scheduler().drain(SHUTDOWN_DRAIN_TIMEOUT)
+    # Close pooled browsers and HTTP connections on shutdown
+    await shutdown_browser_pool()
+    await jobs.puppeteer_service.close()
+    await get_preflight_checker().close()
+    # Stop resume parsing worker processes
+    get_resume_parser().close()
+    # Write buffered log entries so they are read back after a restart
+    await get_log_store().close()
+    # Write selector cache updates still waiting for their delayed save
+    await get_selector_cache().close()
+
 
 # Create FastAPI app
 app = FastAPI(
     title="Deep Job Apply",
     description="Automated job application system using browser automation and AI",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan,
 )
 
 # Configure CORS
@@ -35,6 +66,23 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+# Metrics endpoint
+@app.get("/metrics")
+async def metrics():
+    return {
+        "scheduler": await get_application_scheduler().stats(),
+        "browser_pool": browser_pool_stats(),
+        "automation_http": jobs.puppeteer_service.pool_stats(),
+        "logs": get_log_store().stats(),
+        "password_hashing": users.password_hasher.stats(),
+        "token_cache": users.token_cache.stats(),
+        "resume_files": resumes.resume_files.stats(),
+        "resume_parser": get_resume_parser().stats(),
+        "job_urls": jobs.job_url_index.stats(),
+        "preflight": get_preflight_checker().stats(),
+        "stage_timings": jobs.stage_timings.stats(),
+    }
+
 # Include routers
 app.include_router(users.router, prefix="/api/users", tags=["users"])
 app.include_router(resumes.router, prefix="/api/resumes", tags=["resumes"])
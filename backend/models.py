@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field, EmailStr, HttpUrl
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, ConfigDict, Field, EmailStr, HttpUrl
+from typing import List, Optional, Dict, Any, Tuple
 from enum import Enum
 from datetime import datetime
 import uuid
@@ -13,6 +13,20 @@ class ApplicationStatus(str, Enum):
     FAILED = "failed"
 
 
+class PostingStatus(str, Enum):
+    LIVE = "live"
+    CLOSED = "closed"
+    REDIRECTED = "redirected"
+    LOGIN_WALLED = "login_walled"
+    UNKNOWN = "unknown"
+
+
+class ParseStatus(str, Enum):
+    PENDING = "pending"
+    PARSED = "parsed"
+    FAILED = "failed"
+
+
 # Database Models
 class User(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -36,12 +50,47 @@ class ResumeData(BaseModel):
     custom_fields: Optional[Dict[str, Any]] = None
 
 
+class FillRule(BaseModel):
+    """A resume value and the field descriptions it fills."""
+
+    model_config = ConfigDict(frozen=True)
+
+    key: str
+    value: str
+    keywords: Tuple[str, ...]
+    autocomplete: Tuple[str, ...] = ()
+    tags: Tuple[str, ...] = ("input",)
+
+
+class FillPlan(BaseModel):
+    """Form-fill rules compiled once per resume, in match priority order."""
+
+    model_config = ConfigDict(frozen=True)
+
+    rules: Tuple[FillRule, ...] = ()
+    # CSS selector to value, for the automation service
+    selectors: Dict[str, str] = {}
+
+
+class StageSpan(BaseModel):
+    """How long one stage of an application run took."""
+
+    stage: str
+    started_at: datetime
+    duration_ms: float
+    ok: bool = True
+
+
 class Resume(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
     user_id: str
     filename: str
     file_path: str
+    content_hash: Optional[str] = None
     parsed_data: Optional[ResumeData] = None
+    parse_status: ParseStatus = ParseStatus.PARSED
+    parse_error: Optional[str] = None
+    fill_plan: Optional[FillPlan] = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
 
@@ -51,14 +100,29 @@ class JobApplication(BaseModel):
     user_id: str
     resume_id: str
     job_url: HttpUrl
+    # Key shared by every URL of the same posting
+    canonical_url: Optional[str] = None
     status: ApplicationStatus = ApplicationStatus.PENDING
-    logs: List[Dict[str, Any]] = []
+    # Verdict of the pre-flight check of the job URL
+    posting_status: Optional[PostingStatus] = None
+    job_board: Optional[str] = None
+    # Stage timings of the latest run
+    spans: List[StageSpan] = []
+    batch_id: Optional[str] = None
     error_message: Optional[str] = None
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: datetime = Field(default_factory=datetime.now)
     completed_at: Optional[datetime] = None
 
 
+class JobApplicationBatch(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    resume_id: str
+    application_ids: List[str] = []
+    created_at: datetime = Field(default_factory=datetime.now)
+
+
 # API Request/Response Models
 class UserCreate(BaseModel):
     email: EmailStr
@@ -90,6 +154,8 @@ class ResumeResponse(BaseModel):
     id: str
     filename: str
     parsed_data: Optional[ResumeData] = None
+    parse_status: ParseStatus = ParseStatus.PARSED
+    parse_error: Optional[str] = None
     created_at: datetime
 
 
@@ -98,15 +164,46 @@ class JobApplicationCreate(BaseModel):
     job_url: HttpUrl
 
 
+class JobApplicationBatchCreate(BaseModel):
+    resume_id: str
+    job_urls: List[HttpUrl] = Field(..., min_length=1, max_length=500)
+
+
+class JobApplicationBatchResponse(BaseModel):
+    batch_id: str
+    application_ids: List[str]
+    # Submitted URL to the existing application for the same posting
+    duplicates: Dict[str, str] = {}
+    created_at: datetime
+
+
+class JobApplicationBatchStatus(BaseModel):
+    batch_id: str
+    total: int
+    completed: int
+    counts: Dict[ApplicationStatus, int]
+    created_at: datetime
+
+
 class JobApplicationResponse(BaseModel):
     id: str
     job_url: HttpUrl
     status: ApplicationStatus
+    posting_status: Optional[PostingStatus] = None
     error_message: Optional[str] = None
     created_at: datetime
     completed_at: Optional[datetime] = None
 
 
+class JobApplicationTimings(BaseModel):
+    application_id: str
+    job_board: Optional[str] = None
+    spans: List[StageSpan]
+    total_ms: float
+
+
 class JobApplicationLog(BaseModel):
     application_id: str
     logs: List[Dict[str, Any]]
+    # Sequence number to pass as `offset` to fetch the entries after these
+    next_offset: int = 0
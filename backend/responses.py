@@ -0,0 +1,194 @@
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Mapping, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+
+def _etag_matches(header: str, etag: str, weak: bool = True) -> bool:
+    """Check an If-None-Match / If-Range style list against an ETag."""
+    if header.strip() == "*":
+        return True
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if weak:
+            candidate = candidate[2:] if candidate.startswith("W/") else candidate
+            if candidate == (etag[2:] if etag.startswith("W/") else etag):
+                return True
+        elif not etag.startswith("W/") and candidate == etag:
+            return True
+    return False
+
+
+def _not_modified_since(header: str, mtime: float) -> bool:
+    try:
+        since = parsedate_to_datetime(header).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one second resolution
+    return int(mtime) <= since
+
+
+def _parse_range(header: str, size: int) -> Optional[Tuple[int, int]]:
+    """
+    Parse a single `bytes=` range into an inclusive (start, end).
+    Returns None for headers this response ignores (other units or
+    several ranges) and raises ValueError for unsatisfiable ranges.
+    """
+    unit, _, ranges = header.partition("=")
+    if unit.strip().lower() != "bytes" or "," in ranges:
+        return None
+    first, _, last = ranges.strip().partition("-")
+    try:
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length <= 0:
+                raise ValueError("Empty suffix range")
+            return max(0, size - length), size - 1
+        start = int(first)
+        end = int(last) if last else size - 1
+    except ValueError:
+        raise ValueError(f"Invalid range {header}")
+    if start >= size or end < start:
+        raise ValueError(f"Unsatisfiable range {header}")
+    return start, min(end, size - 1)
+
+
+class RangedFileResponse(Response):
+    """
+    File response with a strong content-hash ETag, conditional GET
+    (If-None-Match, If-Modified-Since -> 304) and single byte ranges
+    (Range, If-Range -> 206 or 416).
+
+    The body is handed to the server with the ASGI zero-copy send
+    extension when it is offered, so the kernel copies the file straight
+    to the socket. Otherwise whole files use the path send extension,
+    and as a last resort the file is streamed in chunks.
+    """
+
+    chunk_size = 64 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        stat_result: os.stat_result,
+        request_headers: Mapping[str, str],
+        etag: Optional[str] = None,
+        filename: Optional[str] = None,
+        media_type: str = "application/octet-stream",
+        cache_control: str = "private, no-cache",
+    ):
+        self.path = path
+        self.media_type = media_type
+        self.background = None
+        self.size = stat_result.st_size
+        self.offset = 0
+        self.count = self.size
+        self.send_body = True
+
+        etag = etag or f'W/"{int(stat_result.st_mtime)}-{self.size}"'
+        headers = {
+            "etag": etag,
+            "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+            "accept-ranges": "bytes",
+            "cache-control": cache_control,
+        }
+        if filename is not None:
+            quoted = quote(filename)
+            headers["content-disposition"] = (
+                f"attachment; filename*=utf-8''{quoted}"
+                if quoted != filename
+                else f'attachment; filename="{filename}"'
+            )
+
+        if_none_match = request_headers.get("if-none-match")
+        if_modified_since = request_headers.get("if-modified-since")
+        if (if_none_match is not None and _etag_matches(if_none_match, etag)) or (
+            if_none_match is None
+            and if_modified_since is not None
+            and _not_modified_since(if_modified_since, stat_result.st_mtime)
+        ):
+            self.status_code = 304
+            self.send_body = False
+            self.init_headers(headers)
+            return
+
+        self.status_code = 200
+        range_header = request_headers.get("range")
+        if range_header and self._range_applies(
+            request_headers.get("if-range"), etag, stat_result.st_mtime
+        ):
+            try:
+                byte_range = _parse_range(range_header, self.size)
+            except ValueError:
+                self.status_code = 416
+                self.send_body = False
+                headers["content-range"] = f"bytes */{self.size}"
+                headers["content-length"] = "0"
+                self.init_headers(headers)
+                return
+            if byte_range is not None:
+                start, end = byte_range
+                self.status_code = 206
+                self.offset = start
+                self.count = end - start + 1
+                headers["content-range"] = f"bytes {start}-{end}/{self.size}"
+
+        headers["content-length"] = str(self.count)
+        self.init_headers(headers)
+
+    @staticmethod
+    def _range_applies(if_range: Optional[str], etag: str, mtime: float) -> bool:
+        if if_range is None:
+            return True
+        if if_range.strip().startswith(('"', "W/")):
+            return _etag_matches(if_range, etag, weak=False)
+        return _not_modified_since(if_range, mtime)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send(
+            {
+                "type": "http.response.start",
+                "status": self.status_code,
+                "headers": self.raw_headers,
+            }
+        )
+        extensions = scope.get("extensions") or {}
+        if not self.send_body or scope["method"].upper() == "HEAD" or self.count == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+        elif "http.response.zerocopysend" in extensions:
+            with open(self.path, "rb") as file:
+                await send(
+                    {
+                        "type": "http.response.zerocopysend",
+                        "file": file,
+                        "offset": self.offset,
+                        "count": self.count,
+                        "more_body": False,
+                    }
+                )
+        elif "http.response.pathsend" in extensions and self.count == self.size:
+            await send({"type": "http.response.pathsend", "path": str(self.path)})
+        else:
+            async with await anyio.open_file(self.path, mode="rb") as file:
+                await file.seek(self.offset)
+                remaining = self.count
+                while remaining > 0:
+                    chunk = await file.read(min(self.chunk_size, remaining))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    await send(
+                        {
+                            "type": "http.response.body",
+                            "body": chunk,
+                            "more_body": remaining > 0,
+                        }
+                    )
+                if remaining > 0:
+                    # File shrank underneath us, end the response
+                    await send({"type": "http.response.body", "body": b"", "more_body": False})
@@ -1,6 +1,7 @@
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, Header, HTTPException, status, Query, Response
+from fastapi.responses import StreamingResponse
 from typing import List, Optional, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta
 import uuid
 import asyncio
 import os
@@ -8,164 +9,273 @@ import json
 
 from models import (
     JobApplication,
+    JobApplicationBatch,
     JobApplicationCreate,
+    JobApplicationBatchCreate,
+    JobApplicationBatchResponse,
+    JobApplicationBatchStatus,
     JobApplicationResponse,
     JobApplicationLog,
+    JobApplicationTimings,
     ApplicationStatus,
     User,
     Resume,
 )
 from routers.users import get_current_active_user
-from routers.resumes import fake_resumes_db
+from routers.resumes import resumes_db
+from database import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    get_repository,
+)
+from automation.boards import get_board_registry
 from services.puppeteer_service import PuppeteerService
+from services.job_application_service import get_job_application_service
+from services.job_urls import JobURLIndex
+from services.log_store import get_log_store
+from services.preflight import get_preflight_checker
+from services.resume_parser import get_fill_plan
+from services.scheduler import SchedulerClosedError, get_application_scheduler
+from services.timing import SpanRecorder, get_stage_timings
 
 # Create router
 router = APIRouter()
 
-# Mock database (replace with actual database in production)
-fake_jobs_db = {}
+# Job application and batch storage
+jobs_db = get_repository("job_applications", JobApplication)
+batches_db = get_repository("job_application_batches", JobApplicationBatch)
+
+# Each user's applications by canonical job URL
+job_url_index = JobURLIndex()
+job_url_index.rebuild(jobs_db.list_by_created())
+
+# Per-application logs
+log_store = get_log_store()
 
 # Initialize Puppeteer service
 puppeteer_service = PuppeteerService()
 
+# Checks job postings are still open before automation runs
+preflight_checker = get_preflight_checker()
+
+# Stage duration histograms per job board
+stage_timings = get_stage_timings()
+
+# Automation backend used for new applications: "puppeteer" sends them to
+# the automation service, "playwright" runs them in-process
+AUTOMATION_BACKEND = os.environ.get("AUTOMATION_BACKEND", "puppeteer")
+
+# Seconds between keep-alive comments on idle log streams
+LOG_STREAM_KEEPALIVE_SECONDS = float(os.environ.get("LOG_STREAM_KEEPALIVE_SECONDS", "15"))
+
 # Helper functions
+def add_log(application_id: str, message: str, level: str = "info"):
+    """
+    Append a log entry to a job application.
+    """
+    log_store.append(application_id, message, level)
+
+
+def update_status(application_id: str, status: ApplicationStatus, **fields):
+    """
+    Change a job application's status and wake readers of its log stream.
+    """
+    application = jobs_db.update(application_id, status=status, **fields)
+    log_store.notify(application_id)
+    return application
+
+
 async def process_job_application(application_id: str):
     """
     Process a job application in the background.
     This function uses Puppeteer for browser automation to apply for the job.
+    Returns True if the application was successful, False otherwise.
     """
     # Get the application from the database
-    application = fake_jobs_db.get(application_id)
+    application = jobs_db.get(application_id)
     if not application:
-        return
+        return False
 
     # Update status to processing
-    application["status"] = ApplicationStatus.PROCESSING
-    application["updated_at"] = datetime.now()
+    update_status(application_id, ApplicationStatus.PROCESSING, updated_at=datetime.now())
 
     # Add a log entry
-    application["logs"].append(
-        {
-            "timestamp": datetime.now().isoformat(),
-            "message": "Starting job application process",
-            "level": "info",
-        }
-    )
+    await log_store.open(application_id)
+    add_log(application_id, "Starting job application process")
+
+    # Stage timings, rolled up per job board when the run ends
+    spans = SpanRecorder()
+    job_board = get_board_registry().lookup(str(application["job_url"])).name
 
     try:
         # Get the resume information
         resume_id = application["resume_id"]
-        resume = fake_resumes_db.get(resume_id)
+        resume = resumes_db.get(resume_id)
         if not resume:
             raise Exception("Resume not found")
         
-        resume_path = resume["path"]
-        
+        resume_path = resume["file_path"]
+
+        # Use the stored parse result and its precompiled fill plan
+        fill_plan = get_fill_plan(resumes_db, resume)
+        if fill_plan is None:
+            raise Exception("Resume has not been parsed")
+        resume_data = resume["parsed_data"]
+
         # Extract job URL from the application
-        job_url = application["job_url"]
-        
-        # Prepare resume data
-        resume_data = {
-            "name": "Nick Krzemienski",
-            "title": "Engineering Lead, Video Innovations @ fuboTV",
-            "summary": """Over 12 years of experience in software engineering management and technical leadership. 
-            Transitioned into the OTT video space in 2016, expanding expertise in mobile and web development.
-            Pioneered a shared Swift library for iOS/tvOS apps, separating the UI from the player for scalability.""",
-            "contact_info": {
-                "email": "krzemienski@gmail.com",
-                "phone": "",
-                "website": "awesome.video",
-                "github": "github.com/krzemienski",
-                "twitter": "twitter.com/nkrzemienski"
-            },
-            "experience": [
-                "Engineering Lead, Video Innovations, fuboTV Inc.",
-                "Engineering Lead, VOD Encoding & Operations, fuboTV Inc.",
-                "Engineering Manager, AppleTV & Roku, fuboTV Inc.",
-                "Software Engineer, iOS, fuboTV Inc.",
-                "Principal Developer & Founder, KODA LABS INC."
-            ],
-            "education": "Bachelor of Computer Science, Iona College"
-        }
-        
+        job_url = str(application["job_url"])
+
+        # Only send postings that are still open to the automation service
+        with spans.span("preflight"):
+            verdict = await preflight_checker.check(job_url)
+        jobs_db.update(application_id, posting_status=verdict.status)
+        add_log(application_id, f"Pre-flight check: {verdict.reason}")
+        if not verdict.proceed:
+            raise Exception(verdict.reason)
+
         # Apply to the job using Puppeteer service
-        success, logs = await puppeteer_service.apply_to_job(job_url, resume_path, resume_data)
+        with spans.span("automation_service") as outcome:
+            success, logs = await puppeteer_service.apply_to_job(
+                job_url, resume_path, resume_data, fill_plan, spans
+            )
+            outcome["ok"] = success
         
         # Add the logs from the puppeteer service
-        for log in logs:
-            application["logs"].append(log)
+        log_store.extend(application_id, logs)
         
         if success:
-            application["status"] = ApplicationStatus.SUCCEEDED
-            application["logs"].append(
-                {
-                    "timestamp": datetime.now().isoformat(),
-                    "message": "Successfully applied to job",
-                    "level": "info",
-                }
-            )
+            update_status(application_id, ApplicationStatus.SUCCEEDED)
+            add_log(application_id, "Successfully applied to job")
         else:
-            application["status"] = ApplicationStatus.FAILED
-            application["error_message"] = "Failed to apply to job"
-            application["logs"].append(
-                {
-                    "timestamp": datetime.now().isoformat(),
-                    "message": "Failed to apply to job",
-                    "level": "error",
-                }
+            update_status(
+                application_id, ApplicationStatus.FAILED, error_message="Failed to apply to job"
             )
+            add_log(application_id, "Failed to apply to job", "error")
     except Exception as e:
         # Handle errors
-        application["status"] = ApplicationStatus.FAILED
-        application["error_message"] = str(e)
-        application["logs"].append(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "message": f"Error applying to job: {str(e)}",
-                "level": "error",
-            }
+        update_status(application_id, ApplicationStatus.FAILED, error_message=str(e))
+        add_log(application_id, f"Error applying to job: {str(e)}", "error")
+
+    # Update completion time and record where the time went
+    application = jobs_db.update(
+        application_id,
+        completed_at=datetime.now(),
+        updated_at=datetime.now(),
+        job_board=job_board,
+        spans=spans.spans,
+    )
+    stage_timings.observe(job_board, spans.spans)
+    # The run is over, keep its log on disk only
+    log_store.release(application_id)
+
+    return application["status"] == ApplicationStatus.SUCCEEDED
+
+
+async def abandon_job_application(application_id: str, attempts: int):
+    """
+    Fail an application whose work the scheduler gave up on after its
+    lease expired on every attempt.
+    """
+    if jobs_db.get(application_id) is None:
+        return
+    message = f"Gave up after {attempts} attempt(s) that did not finish"
+    await log_store.open(application_id)
+    update_status(
+        application_id,
+        ApplicationStatus.FAILED,
+        error_message=message,
+        completed_at=datetime.now(),
+        updated_at=datetime.now(),
+    )
+    add_log(application_id, message, "error")
+    log_store.release(application_id)
+
+
+# Run applications on the shared scheduler
+application_scheduler = get_application_scheduler()
+application_scheduler.register_abandon_handler(abandon_job_application)
+application_scheduler.register("puppeteer", process_job_application)
+application_scheduler.register(
+    "playwright",
+    get_job_application_service(jobs_db, resumes_db).process_application,
+)
+
+
+async def schedule_applications(application_ids: List[str]):
+    """
+    Queue applications on the scheduler in a single submission.
+    """
+    try:
+        await application_scheduler.submit_many(AUTOMATION_BACKEND, application_ids)
+    except SchedulerClosedError:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is shutting down, try again later",
         )
 
-    # Update completion time
-    application["completed_at"] = datetime.now()
-    application["updated_at"] = datetime.now()
+
+def discard_applications(user_id: str, job_applications: List[JobApplication]):
+    """
+    Remove applications that could not be queued, and their job URL
+    index entries, so the postings can be applied to again.
+    """
+    for job_application in job_applications:
+        jobs_db.delete(job_application.id)
+        job_url_index.remove(user_id, job_application.canonical_url, job_application.id)
 
 
 # Endpoints
 @router.post("/", response_model=JobApplicationResponse)
 async def create_job_application(
     job_create: JobApplicationCreate,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Create a new job application task.
     """
     # Check if the resume exists and belongs to the user
-    if job_create.resume_id not in fake_resumes_db:
+    if job_create.resume_id not in resumes_db:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found"
         )
 
-    resume_data = fake_resumes_db[job_create.resume_id]
+    resume_data = resumes_db.get(job_create.resume_id)
     if resume_data["user_id"] != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Not authorized to use this resume",
         )
 
+    # Reject repeat applications to the same posting
+    canonical_url = job_url_index.canonicalize(job_create.job_url)
+    existing_id = job_url_index.get(current_user.id, canonical_url)
+    if existing_id is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Already applied to this job in application {existing_id}",
+            headers={"X-Existing-Application": existing_id},
+        )
+
     # Create job application
     job_application = JobApplication(
         user_id=current_user.id,
         resume_id=job_create.resume_id,
         job_url=job_create.job_url,
+        canonical_url=canonical_url,
     )
 
     # Store in database
-    fake_jobs_db[job_application.id] = job_application.dict()
+    jobs_db.create(job_application.dict())
+    job_url_index.add(current_user.id, canonical_url, job_application.id)
 
-    # Start background task to process the application
-    background_tasks.add_task(process_job_application, job_application.id)
+    # Queue the application for processing
+    try:
+        await schedule_applications([job_application.id])
+    except Exception:
+        discard_applications(current_user.id, [job_application])
+        raise
 
     # Return response
     return JobApplicationResponse(
@@ -177,27 +287,157 @@ async def create_job_application(
     )
 
 
+@router.post("/batch", response_model=JobApplicationBatchResponse)
+async def create_job_application_batch(
+    batch_create: JobApplicationBatchCreate,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Create job applications for many URLs with one resume.
+    The resume is checked once and all applications are queued together.
+    URLs for a posting the user already applied to, or that repeat an
+    earlier URL in the batch, are returned in `duplicates` with the
+    existing application's ID instead of being applied to again.
+    """
+    # Check if the resume exists and belongs to the user
+    if batch_create.resume_id not in resumes_db:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found"
+        )
+
+    resume_data = resumes_db.get(batch_create.resume_id)
+    if resume_data["user_id"] != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to use this resume",
+        )
+
+    # Create all job applications
+    batch_id = str(uuid.uuid4())
+    created_at = datetime.now()
+    job_applications = []
+    duplicates = {}
+    for job_url in batch_create.job_urls:
+        canonical_url = job_url_index.canonicalize(job_url)
+        existing_id = job_url_index.get(current_user.id, canonical_url)
+        if existing_id is not None:
+            duplicates[str(job_url)] = existing_id
+            continue
+        job_application = JobApplication(
+            user_id=current_user.id,
+            resume_id=batch_create.resume_id,
+            job_url=job_url,
+            canonical_url=canonical_url,
+            batch_id=batch_id,
+            created_at=created_at,
+            updated_at=created_at,
+        )
+        job_applications.append(job_application)
+        job_url_index.add(current_user.id, canonical_url, job_application.id)
+    application_ids = [job_application.id for job_application in job_applications]
+
+    # Store in database
+    jobs_db.create_many([job_application.dict() for job_application in job_applications])
+    batches_db.create(
+        JobApplicationBatch(
+            id=batch_id,
+            user_id=current_user.id,
+            resume_id=batch_create.resume_id,
+            application_ids=application_ids,
+            created_at=created_at,
+        ).dict()
+    )
+
+    # Queue all applications for processing
+    if application_ids:
+        try:
+            await schedule_applications(application_ids)
+        except Exception:
+            discard_applications(current_user.id, job_applications)
+            batches_db.delete(batch_id)
+            raise
+
+    return JobApplicationBatchResponse(
+        batch_id=batch_id,
+        application_ids=application_ids,
+        duplicates=duplicates,
+        created_at=created_at,
+    )
+
+
+@router.get("/batch/{batch_id}", response_model=JobApplicationBatchStatus)
+async def get_job_application_batch(
+    batch_id: str, current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get the aggregate progress of a batch of job applications.
+    """
+    batch = batches_db.get(batch_id)
+    if batch is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Batch not found"
+        )
+
+    # Check if the batch belongs to the current user
+    if batch["user_id"] != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this batch",
+        )
+
+    counts = {application_status: 0 for application_status in ApplicationStatus}
+    for application_id in batch["application_ids"]:
+        app_data = jobs_db.get(application_id)
+        if app_data:
+            counts[app_data["status"]] += 1
+
+    return JobApplicationBatchStatus(
+        batch_id=batch_id,
+        total=sum(counts.values()),
+        completed=counts[ApplicationStatus.SUCCEEDED] + counts[ApplicationStatus.FAILED],
+        counts=counts,
+        created_at=batch["created_at"],
+    )
+
+
 @router.get("/", response_model=List[JobApplicationResponse])
 async def list_job_applications(
+    response: Response,
     status: Optional[ApplicationStatus] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
     current_user: User = Depends(get_current_active_user),
 ):
     """
-    List all job applications for the current user.
-    Optionally filter by status.
+    List job applications for the current user, one page at a time.
+    Optionally filter by status. Results are ordered by creation time.
+    When more results exist, the cursor for the next page is returned in
+    the X-Next-Cursor header.
     """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    page = jobs_db.page_by_user(
+        current_user.id, status, limit=limit + 1, after=after, descending=order == "desc"
+    )
+    if len(page) > limit:
+        page = page[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(page[-1])
+
     user_applications = [
         JobApplicationResponse(
-            id=app_id,
+            id=app_data["id"],
             job_url=app_data["job_url"],
             status=app_data["status"],
+            posting_status=app_data.get("posting_status"),
             error_message=app_data.get("error_message"),
             created_at=app_data["created_at"],
             completed_at=app_data.get("completed_at"),
         )
-        for app_id, app_data in fake_jobs_db.items()
-        if app_data["user_id"] == current_user.id
-        and (status is None or app_data["status"] == status)
+        for app_data in page
     ]
     return user_applications
 
@@ -209,13 +449,12 @@ async def get_job_application(
     """
     Get a specific job application by ID.
     """
-    if application_id not in fake_jobs_db:
+    app_data = jobs_db.get(application_id)
+    if app_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found"
         )
 
-    app_data = fake_jobs_db[application_id]
-
     # Check if the application belongs to the current user
     if app_data["user_id"] != current_user.id:
         raise HTTPException(
@@ -227,6 +466,7 @@ async def get_job_application(
         id=application_id,
         job_url=app_data["job_url"],
         status=app_data["status"],
+        posting_status=app_data.get("posting_status"),
         error_message=app_data.get("error_message"),
         created_at=app_data["created_at"],
         completed_at=app_data.get("completed_at"),
@@ -235,18 +475,24 @@ async def get_job_application(
 
 @router.get("/{application_id}/logs", response_model=JobApplicationLog)
 async def get_job_application_logs(
-    application_id: str, current_user: User = Depends(get_current_active_user)
+    application_id: str,
+    offset: Optional[int] = Query(None, ge=0),
+    since: Optional[int] = Query(None, ge=-1),
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE),
+    current_user: User = Depends(get_current_active_user),
 ):
     """
     Get logs for a specific job application.
+    Pass `offset` (the first sequence number wanted) or `since` (the last
+    sequence number seen) to get only newer entries. The response's
+    `next_offset` is the offset to use on the next call.
     """
-    if application_id not in fake_jobs_db:
+    app_data = jobs_db.get(application_id)
+    if app_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found"
         )
 
-    app_data = fake_jobs_db[application_id]
-
     # Check if the application belongs to the current user
     if app_data["user_id"] != current_user.id:
         raise HTTPException(
@@ -254,9 +500,125 @@ async def get_job_application_logs(
             detail="Not authorized to access this job application",
         )
 
+    if offset is None:
+        offset = since + 1 if since is not None else 0
+    records = await log_store.read_from(application_id, offset)
+    if limit is not None:
+        records = records[:limit]
+
     return JobApplicationLog(
         application_id=application_id,
-        logs=app_data.get("logs", []),
+        logs=[record.to_dict() for record in records],
+        next_offset=records[-1].seq + 1 if records else offset,
+    )
+
+
+@router.get("/{application_id}/timings", response_model=JobApplicationTimings)
+async def get_job_application_timings(
+    application_id: str, current_user: User = Depends(get_current_active_user)
+):
+    """
+    Get how long each stage of the latest run of a job application took,
+    in the order the stages finished.
+    """
+    app_data = jobs_db.get(application_id)
+    if app_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found"
+        )
+
+    # Check if the application belongs to the current user
+    if app_data["user_id"] != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this job application",
+        )
+
+    spans = app_data.get("spans") or []
+    total_ms = 0.0
+    if spans:
+        # Wall-clock time of the run, as stages reported by the automation
+        # service run inside its "automation_service" stage
+        start = min(span["started_at"] for span in spans)
+        end = max(
+            span["started_at"] + timedelta(milliseconds=span["duration_ms"]) for span in spans
+        )
+        total_ms = round((end - start).total_seconds() * 1000, 1)
+
+    return JobApplicationTimings(
+        application_id=application_id,
+        job_board=app_data.get("job_board"),
+        spans=spans,
+        total_ms=total_ms,
+    )
+
+
+@router.get("/{application_id}/logs/stream")
+async def stream_job_application_logs(
+    application_id: str,
+    offset: Optional[int] = Query(None, ge=0),
+    last_event_id: Optional[str] = Header(None),
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Stream log entries and status changes for a job application as
+    Server-Sent Events.
+    Each log event's ID is the entry's sequence number. Reconnecting clients resume
+    after the Last-Event-ID header, or from the `offset` query parameter.
+    The stream ends once the application has finished and its logs have
+    been sent.
+    """
+    app_data = jobs_db.get(application_id)
+    if app_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found"
+        )
+
+    # Check if the application belongs to the current user
+    if app_data["user_id"] != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this job application",
+        )
+
+    if offset is None:
+        offset = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+
+    async def events():
+        position = offset
+        last_status = None
+        while True:
+            # Take the change event before reading so no append is missed
+            changed = log_store.changed(application_id)
+            application = jobs_db.get(application_id)
+            if application is None:
+                return
+
+            records = await log_store.read_from(application_id, position)
+            for record in records:
+                yield f"id: {record.seq}\nevent: log\ndata: {json.dumps(record.to_dict())}\n\n"
+                position = record.seq + 1
+
+            current_status = getattr(application["status"], "value", application["status"])
+            if current_status != last_status:
+                last_status = current_status
+                yield f"event: status\ndata: {json.dumps({'status': current_status})}\n\n"
+            if current_status in (
+                ApplicationStatus.SUCCEEDED.value,
+                ApplicationStatus.FAILED.value,
+            ):
+                log_store.discard_idle(application_id)
+                return
+
+            try:
+                await asyncio.wait_for(changed.wait(), LOG_STREAM_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
@@ -267,13 +629,12 @@ async def delete_job_application(
     """
     Delete a job application.
     """
-    if application_id not in fake_jobs_db:
+    app_data = jobs_db.get(application_id)
+    if app_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found"
         )
 
-    app_data = fake_jobs_db[application_id]
-
     # Check if the application belongs to the current user
     if app_data["user_id"] != current_user.id:
         raise HTTPException(
@@ -282,7 +643,13 @@ async def delete_job_application(
         )
 
     # Remove from database
-    del fake_jobs_db[application_id]
+    jobs_db.delete(application_id)
+    job_url_index.remove(
+        current_user.id,
+        app_data.get("canonical_url") or job_url_index.canonicalize(app_data["job_url"]),
+        application_id,
+    )
+    log_store.delete(application_id)
 
     return None
 
@@ -290,19 +657,17 @@ async def delete_job_application(
 @router.post("/{application_id}/retry", response_model=JobApplicationResponse)
 async def retry_job_application(
     application_id: str,
-    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_active_user),
 ):
     """
     Retry a failed job application.
     """
-    if application_id not in fake_jobs_db:
+    app_data = jobs_db.get(application_id)
+    if app_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Job application not found"
         )
 
-    app_data = fake_jobs_db[application_id]
-
     # Check if the application belongs to the current user
     if app_data["user_id"] != current_user.id:
         raise HTTPException(
@@ -318,27 +683,41 @@ async def retry_job_application(
         )
 
     # Reset application status
-    app_data["status"] = ApplicationStatus.PENDING
-    app_data["error_message"] = None
-    app_data["updated_at"] = datetime.now()
-    app_data["completed_at"] = None
+    update_status(
+        application_id,
+        ApplicationStatus.PENDING,
+        posting_status=None,
+        spans=[],
+        error_message=None,
+        updated_at=datetime.now(),
+        completed_at=None,
+    )
 
     # Add a log entry
-    app_data["logs"].append(
-        {
-            "timestamp": datetime.now().isoformat(),
-            "message": "Retrying job application",
-            "level": "info",
-        }
-    )
+    await log_store.open(application_id)
+    add_log(application_id, "Retrying job application")
+    app_data = jobs_db.get(application_id)
 
-    # Start background task to process the application
-    background_tasks.add_task(process_job_application, application_id)
+    # Queue the application for processing
+    try:
+        await schedule_applications([application_id])
+    except Exception as e:
+        message = getattr(e, "detail", None) or str(e)
+        update_status(
+            application_id,
+            ApplicationStatus.FAILED,
+            error_message=f"Retry was not queued: {message}",
+            completed_at=datetime.now(),
+            updated_at=datetime.now(),
+        )
+        log_store.release(application_id)
+        raise
 
     return JobApplicationResponse(
         id=application_id,
         job_url=app_data["job_url"],
         status=app_data["status"],
+        posting_status=app_data.get("posting_status"),
         error_message=app_data.get("error_message"),
         created_at=app_data["created_at"],
         completed_at=app_data.get("completed_at"),
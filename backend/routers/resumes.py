@@ -1,81 +1,98 @@
-from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Query, Request, Response
+import aiofiles.os
+import asyncio
 import os
-import uuid
-from typing import List, Optional
-import shutil
+from typing import List, Optional, Set
 from datetime import datetime
 
-from models import Resume, ResumeData, ResumeResponse, ResumeUpload, User
+from models import ParseStatus, Resume, ResumeResponse, ResumeUpload, User
 from routers.users import get_current_active_user
+from automation.form_discovery import compile_fill_plan
+from responses import RangedFileResponse
+from database import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    decode_cursor,
+    encode_cursor,
+    get_repository,
+)
+from services.resume_parser import forget_fill_plan, get_resume_parser
+from services.resume_store import ResumeFileStore, ResumeTooLargeError
 
 # Create router
 router = APIRouter()
 
-# Mock database (replace with actual database in production)
-fake_resumes_db = {}
+# Resume storage
+resumes_db = get_repository("resumes", Resume)
 
 # Directory for storing resume files
 UPLOAD_DIR = os.path.join(os.getcwd(), "uploads")
-os.makedirs(UPLOAD_DIR, exist_ok=True)
+
+# Resume files, stored once per content hash
+resume_files = ResumeFileStore(UPLOAD_DIR)
+resume_files.rebuild(resumes_db.list_by_created())
+
+# Resume parsing, cached by content hash
+resume_parser = get_resume_parser()
+resume_parser.seed(resumes_db.list_by_created())
+
+# Uploads larger than this are parsed in the background
+RESUME_SYNC_PARSE_BYTES = int(os.getenv("RESUME_SYNC_PARSE_BYTES", str(1024 * 1024)))
+
+# Background parse tasks, referenced until they finish
+parse_tasks: Set[asyncio.Task] = set()
 
 
 # Helper functions
-def parse_resume_pdf(file_path: str) -> ResumeData:
-    """
-    Parse a resume PDF file and extract structured data.
-    This is a placeholder implementation. In a real application,
-    you would use libraries like PyPDF2, pdfminer.six, or similar.
-    """
-    # For demonstration purposes, we'll use the sample resume data from the prompt
-    return ResumeData(
-        name="Nick Krzemienski",
-        title="Engineering Lead, Video Innovations @ fuboTV",
-        summary="Over 12 years of experience in software engineering management and technical leadership.",
-        core_experience=[
-            "Engineering Lead, Video Innovations, fuboTV Inc.",
-            "Engineering Lead, VOD Encoding & Operations, fuboTV Inc.",
-            "Engineering Manager, AppleTV & Roku, fuboTV Inc.",
-            "Software Engineer, iOS, fuboTV Inc.",
-            "Principal Developer & Founder, KODA LABS INC.",
-            "Squad Leader, United States Marine Corps Reserve",
-            "Founder & Managing Director for various projects",
-            "Mobile Developer, SHODOGG",
-            "Ops Intern, Argus Information and Advisory Services",
-        ],
-        education=["Bachelor of Computer Science, Iona College"],
-        portfolio={
-            "website": "awesome.video",
-            "github": "github.com/krzemienski",
-            "twitter": "twitter.com/nkrzemienski",
-        },
-        contact_info={
-            "email": "krzemienski@gmail.com",
-        },
-        skills=[
-            "Software Engineering Management",
-            "Technical Leadership",
-            "Mobile Development",
-            "Web Development",
-            "OTT Video",
-            "Swift",
-            "FFmpeg",
-            "ISO Standards",
-            "Encoding Workflows",
-            "AWS",
-            "Docker",
-            "Kubernetes",
-        ],
-    )
+async def parse_resume(
+    resume_id: str, content_hash: str, file_path: str, force: bool = False
+) -> Optional[dict]:
+    """
+    Parse a stored resume file and record the result on the resume.
+    Returns the updated resume, or None if it was deleted meanwhile.
+    """
+    try:
+        parsed_data = await resume_parser.parse(content_hash, file_path, force=force)
+        fields = {
+            "parsed_data": parsed_data.dict(),
+            "parse_status": ParseStatus.PARSED,
+            "parse_error": None,
+            "fill_plan": compile_fill_plan(parsed_data).dict(),
+        }
+    except Exception as e:
+        fields = {"parse_status": ParseStatus.FAILED, "parse_error": str(e)}
+
+    if resumes_db.get(resume_id) is None:
+        return None
+    resume = resumes_db.update(resume_id, updated_at=datetime.now(), **fields)
+    # Applications must use the plan compiled from this parse
+    forget_fill_plan(resume_id)
+    return resume
+
+
+def parse_resume_in_background(
+    resume_id: str, content_hash: str, file_path: str, force: bool = False
+):
+    """
+    Parse a resume after the request has returned.
+    """
+    task = asyncio.create_task(parse_resume(resume_id, content_hash, file_path, force))
+    parse_tasks.add(task)
+    task.add_done_callback(parse_tasks.discard)
 
 
 # Endpoints
 @router.post("/upload", response_model=ResumeResponse)
 async def upload_resume(
-    file: UploadFile = File(...), current_user: User = Depends(get_current_active_user)
+    file: UploadFile = File(...),
+    async_parse: bool = False,
+    current_user: User = Depends(get_current_active_user),
 ):
     """
     Upload a resume file (PDF) and parse it to extract structured data.
+    With `async_parse`, or for files over RESUME_SYNC_PARSE_BYTES, the
+    resume is returned with parse_status "pending" and parsed in the
+    background; poll the resume until it is "parsed" or "failed".
     """
     # Validate file type
     if not file.filename.endswith(".pdf"):
@@ -84,59 +101,93 @@ async def upload_resume(
             detail="Only PDF files are supported",
         )
 
-    # Generate a unique filename
-    file_id = str(uuid.uuid4())
-    filename = f"{file_id}_{file.filename}"
-    file_path = os.path.join(UPLOAD_DIR, filename)
-
-    # Save the file
-    with open(file_path, "wb") as buffer:
-        shutil.copyfileobj(file.file, buffer)
-
-    # Parse the resume
+    # Stream the file to disk, stored by content hash and referenced
     try:
-        parsed_data = parse_resume_pdf(file_path)
-    except Exception as e:
-        os.remove(file_path)  # Clean up on error
+        stored = await resume_files.save(file)
+    except ResumeTooLargeError as e:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Error parsing resume: {str(e)}",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(e)
         )
 
+    # Parse the resume, unless an identical file was already parsed
+    parsed_data = resume_parser.cached(stored.content_hash)
+    parse_later = parsed_data is None and (
+        async_parse or stored.size > RESUME_SYNC_PARSE_BYTES
+    )
+    if parsed_data is None and not parse_later:
+        try:
+            parsed_data = await resume_parser.parse(stored.content_hash, stored.path)
+        except Exception as e:
+            await resume_files.release(stored.content_hash)  # Clean up on error
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f"Error parsing resume: {str(e)}",
+            )
+
     # Create resume record
     resume = Resume(
         user_id=current_user.id,
         filename=file.filename,
-        file_path=file_path,
+        file_path=stored.path,
+        content_hash=stored.content_hash,
         parsed_data=parsed_data,
+        parse_status=ParseStatus.PENDING if parse_later else ParseStatus.PARSED,
+        fill_plan=compile_fill_plan(parsed_data) if parsed_data else None,
     )
 
     # Store in database
-    fake_resumes_db[resume.id] = resume.dict()
+    resumes_db.create(resume.dict())
+
+    if parse_later:
+        parse_resume_in_background(resume.id, stored.content_hash, stored.path)
 
     # Return response
     return ResumeResponse(
         id=resume.id,
         filename=resume.filename,
         parsed_data=resume.parsed_data,
+        parse_status=resume.parse_status,
         created_at=resume.created_at,
     )
 
 
 @router.get("/", response_model=List[ResumeResponse])
-async def list_resumes(current_user: User = Depends(get_current_active_user)):
+async def list_resumes(
+    response: Response,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = None,
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    current_user: User = Depends(get_current_active_user),
+):
     """
-    List all resumes for the current user.
+    List resumes for the current user, one page at a time.
+    Results are ordered by creation time. When more results exist, the
+    cursor for the next page is returned in the X-Next-Cursor header.
     """
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+    page = resumes_db.page_by_user(
+        current_user.id, limit=limit + 1, after=after, descending=order == "desc"
+    )
+    if len(page) > limit:
+        page = page[:limit]
+        response.headers["X-Next-Cursor"] = encode_cursor(page[-1])
+
     user_resumes = [
         ResumeResponse(
-            id=resume_id,
+            id=resume_data["id"],
             filename=resume_data["filename"],
             parsed_data=resume_data.get("parsed_data"),
+            parse_status=resume_data.get("parse_status", ParseStatus.PARSED),
+            parse_error=resume_data.get("parse_error"),
             created_at=resume_data["created_at"],
         )
-        for resume_id, resume_data in fake_resumes_db.items()
-        if resume_data["user_id"] == current_user.id
+        for resume_data in page
     ]
     return user_resumes
 
@@ -148,12 +199,45 @@ async def get_resume(
     """
     Get a specific resume by ID.
     """
-    if resume_id not in fake_resumes_db:
+    resume_data = resumes_db.get(resume_id)
+    if resume_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found"
         )
 
-    resume_data = fake_resumes_db[resume_id]
+    # Check if the resume belongs to the current user
+    if resume_data["user_id"] != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Not authorized to access this resume",
+        )
+
+    return ResumeResponse(
+        id=resume_id,
+        filename=resume_data["filename"],
+        parsed_data=resume_data.get("parsed_data"),
+        parse_status=resume_data.get("parse_status", ParseStatus.PARSED),
+        parse_error=resume_data.get("parse_error"),
+        created_at=resume_data["created_at"],
+    )
+
+
+@router.post("/{resume_id}/reparse", response_model=ResumeResponse)
+async def reparse_resume(
+    resume_id: str,
+    async_parse: bool = False,
+    current_user: User = Depends(get_current_active_user),
+):
+    """
+    Parse a resume again, bypassing the parse cache.
+    With `async_parse` the resume is returned as "pending" and parsed in
+    the background.
+    """
+    resume_data = resumes_db.get(resume_id)
+    if resume_data is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found"
+        )
 
     # Check if the resume belongs to the current user
     if resume_data["user_id"] != current_user.id:
@@ -162,28 +246,51 @@ async def get_resume(
             detail="Not authorized to access this resume",
         )
 
+    # Resumes stored before content hashing are cached under their ID
+    content_hash = resume_data.get("content_hash") or resume_id
+    if async_parse:
+        resume_data = resumes_db.update(
+            resume_id, parse_status=ParseStatus.PENDING, parse_error=None
+        )
+        parse_resume_in_background(
+            resume_id, content_hash, resume_data["file_path"], force=True
+        )
+    else:
+        resume_data = await parse_resume(
+            resume_id, content_hash, resume_data["file_path"], force=True
+        )
+        if resume_data is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found"
+            )
+
     return ResumeResponse(
         id=resume_id,
         filename=resume_data["filename"],
         parsed_data=resume_data.get("parsed_data"),
+        parse_status=resume_data.get("parse_status", ParseStatus.PARSED),
+        parse_error=resume_data.get("parse_error"),
         created_at=resume_data["created_at"],
     )
 
 
 @router.get("/{resume_id}/download")
 async def download_resume(
-    resume_id: str, current_user: User = Depends(get_current_active_user)
+    resume_id: str,
+    request: Request,
+    current_user: User = Depends(get_current_active_user),
 ):
     """
     Download the original resume file.
+    Supports conditional requests against the content-hash ETag or the
+    modification time (304) and single byte ranges (206).
     """
-    if resume_id not in fake_resumes_db:
+    resume_data = resumes_db.get(resume_id)
+    if resume_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found"
         )
 
-    resume_data = fake_resumes_db[resume_id]
-
     # Check if the resume belongs to the current user
     if resume_data["user_id"] != current_user.id:
         raise HTTPException(
@@ -192,13 +299,21 @@ async def download_resume(
         )
 
     file_path = resume_data["file_path"]
-    if not os.path.exists(file_path):
+    try:
+        stat_result = await aiofiles.os.stat(file_path)
+    except FileNotFoundError:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Resume file not found"
         )
 
-    return FileResponse(
-        file_path, filename=resume_data["filename"], media_type="application/pdf"
+    content_hash = resume_data.get("content_hash")
+    return RangedFileResponse(
+        file_path,
+        stat_result,
+        request.headers,
+        etag=f'"{content_hash}"' if content_hash else None,
+        filename=resume_data["filename"],
+        media_type="application/pdf",
     )
 
 
@@ -209,13 +324,12 @@ async def delete_resume(
     """
     Delete a resume.
     """
-    if resume_id not in fake_resumes_db:
+    resume_data = resumes_db.get(resume_id)
+    if resume_data is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND, detail="Resume not found"
         )
 
-    resume_data = fake_resumes_db[resume_id]
-
     # Check if the resume belongs to the current user
     if resume_data["user_id"] != current_user.id:
         raise HTTPException(
@@ -223,12 +337,14 @@ async def delete_resume(
             detail="Not authorized to delete this resume",
         )
 
-    # Delete the file
-    file_path = resume_data["file_path"]
-    if os.path.exists(file_path):
-        os.remove(file_path)
-
     # Remove from database
-    del fake_resumes_db[resume_id]
+    resumes_db.delete(resume_id)
+    forget_fill_plan(resume_id)
+
+    # Delete the file once no other resume shares it
+    if resume_data.get("content_hash"):
+        await resume_files.release(resume_data["content_hash"])
+    elif os.path.exists(resume_data["file_path"]):
+        os.remove(resume_data["file_path"])
 
     return None
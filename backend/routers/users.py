@@ -8,12 +8,16 @@ import os
 from pydantic import EmailStr
 
 from models import User, UserCreate, UserResponse, Token, TokenData
+from services.password_hasher import PasswordHasher
+from services.token_cache import TokenCache
 
 # Create router
 router = APIRouter()
 
 # Password hashing
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+# Runs bcrypt off the event loop
+password_hasher = PasswordHasher(pwd_context)
 
 # JWT settings
 SECRET_KEY = os.getenv("SECRET_KEY", "your-secret-key-for-development")
@@ -26,14 +30,18 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 # Mock database (replace with actual database in production)
 fake_users_db = {}
 
+# Verified tokens and the users they resolve to. Users are never changed
+# after registering, so cached tokens expire only with their exp claim.
+token_cache = TokenCache()
+
 
 # Helper functions
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
+async def verify_password(plain_password, hashed_password):
+    return await password_hasher.verify(plain_password, hashed_password)
 
 
-def get_password_hash(password):
-    return pwd_context.hash(password)
+async def get_password_hash(password):
+    return await password_hasher.hash(password)
 
 
 def get_user(db, email: str):
@@ -42,11 +50,11 @@ def get_user(db, email: str):
         return User(**user_dict)
 
 
-def authenticate_user(db, email: str, password: str):
+async def authenticate_user(db, email: str, password: str):
     user = get_user(db, email)
     if not user:
         return None
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password(password, user.hashed_password):
         return None
     return user
 
@@ -68,6 +76,9 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+    cached = token_cache.get(token)
+    if cached is not None:
+        return cached.user
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
         email: str = payload.get("sub")
@@ -79,6 +90,7 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     user = get_user(fake_users_db, email=token_data.email)
     if user is None:
         raise credentials_exception
+    token_cache.put(token, payload, user)
     return user
 
 
@@ -91,7 +103,7 @@ async def get_current_active_user(current_user: User = Depends(get_current_user)
 # Endpoints
 @router.post("/token", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
-    user = authenticate_user(fake_users_db, form_data.username, form_data.password)
+    user = await authenticate_user(fake_users_db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -120,13 +132,20 @@ async def register_user(user_create: UserCreate):
             detail="Email already registered",
         )
 
-    hashed_password = get_password_hash(user_create.password)
+    hashed_password = await get_password_hash(user_create.password)
     user = User(
         email=user_create.email,
         hashed_password=hashed_password,
         full_name=user_create.full_name,
     )
 
+    # Another registration for the email may have finished while hashing
+    if user_create.email in fake_users_db:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+
     # Store user in database
     fake_users_db[user.email] = user.dict()
 
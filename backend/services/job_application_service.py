@@ -3,18 +3,38 @@ import os
 from datetime import datetime
 from typing import Dict, Any, List, Optional
 
-from backend.models import JobApplication, Resume, ApplicationStatus
-from backend.automation.browser import apply_to_job_url
+from models import JobApplication, Resume, ApplicationStatus
+from automation.boards import get_board_registry
+from automation.browser import apply_to_job_url
+from database import Repository
+from services.log_store import get_log_store
+from services.preflight import get_preflight_checker
+from services.resume_parser import get_fill_plan
+from services.timing import SpanRecorder, get_stage_timings
 
 
 class JobApplicationService:
     """
     Service for processing job applications using browser automation.
+    Applications are run by the application scheduler, which calls
+    `process_application` from one of its workers.
     """
 
-    def __init__(self, jobs_db: Dict[str, Dict], resumes_db: Dict[str, Dict]):
+    def __init__(self, jobs_db: Repository, resumes_db: Repository):
         self.jobs_db = jobs_db
         self.resumes_db = resumes_db
+        self.log_store = get_log_store()
+        self.preflight = get_preflight_checker()
+        self.stage_timings = get_stage_timings()
+
+    def _log(self, application_id: str, message: str, level: str = "info"):
+        """Append a log entry to the application."""
+        self.log_store.append(application_id, message, level)
+
+    def _set_status(self, application_id: str, status: ApplicationStatus, **fields):
+        """Change the application's status and wake readers of its log stream."""
+        self.jobs_db.update(application_id, status=status, **fields)
+        self.log_store.notify(application_id)
 
     async def process_application(self, application_id: str) -> bool:
         """
@@ -27,18 +47,19 @@ class JobApplicationService:
             return False
 
         # Update status to processing
-        application["status"] = ApplicationStatus.PROCESSING
-        application["updated_at"] = datetime.now()
-        application["logs"] = application.get("logs", [])
+        self._set_status(
+            application_id,
+            ApplicationStatus.PROCESSING,
+            updated_at=datetime.now(),
+        )
 
         # Add a log entry
-        application["logs"].append(
-            {
-                "timestamp": datetime.now().isoformat(),
-                "message": "Starting job application process",
-                "level": "info",
-            }
-        )
+        await self.log_store.open(application_id)
+        self._log(application_id, "Starting job application process")
+
+        # Stage timings, rolled up per job board when the run ends
+        spans = SpanRecorder()
+        job_board = get_board_registry().lookup(str(application["job_url"])).name
 
         try:
             # Get the resume
@@ -52,64 +73,68 @@ class JobApplicationService:
             if not os.path.exists(resume_path):
                 raise ValueError(f"Resume file not found at {resume_path}")
 
-            # Get the job URL
-            job_url = application["job_url"]
+            # Get the fill plan compiled when the resume was parsed
+            fill_plan = get_fill_plan(self.resumes_db, resume_data)
+            if fill_plan is None:
+                raise ValueError(f"Resume with ID {resume_id} has not been parsed")
 
-            # Apply to the job
-            success, logs = await apply_to_job_url(
-                job_url, resume_path, resume_data["parsed_data"]
+            # Get the job URL
+            job_url = str(application["job_url"])
+
+            # Only lease a browser for postings that are still open
+            with spans.span("preflight"):
+                verdict = await self.preflight.check(job_url)
+            self.jobs_db.update(application_id, posting_status=verdict.status)
+            self._log(application_id, f"Pre-flight check: {verdict.reason}")
+            if not verdict.proceed:
+                raise ValueError(verdict.reason)
+
+            # Apply to the job, streaming automation logs into the log store
+            success, _ = await apply_to_job_url(
+                job_url,
+                resume_path,
+                resume_data["parsed_data"],
+                log_sink=self.log_store.sink(application_id),
+                fill_plan=fill_plan,
+                spans=spans,
             )
 
-            # Add browser automation logs to application logs
-            for log in logs:
-                application["logs"].append(
-                    {
-                        "timestamp": datetime.now().isoformat(),
-                        "message": log["message"],
-                        "level": log["level"],
-                    }
-                )
-
             # Update application status based on result
             if success:
-                application["status"] = ApplicationStatus.SUCCEEDED
-                application["logs"].append(
-                    {
-                        "timestamp": datetime.now().isoformat(),
-                        "message": "Successfully applied to job",
-                        "level": "info",
-                    }
-                )
+                self._set_status(application_id, ApplicationStatus.SUCCEEDED)
+                self._log(application_id, "Successfully applied to job")
             else:
-                application["status"] = ApplicationStatus.FAILED
-                application["error_message"] = "Failed to apply to job"
-                application["logs"].append(
-                    {
-                        "timestamp": datetime.now().isoformat(),
-                        "message": "Failed to apply to job",
-                        "level": "error",
-                    }
+                self._set_status(
+                    application_id,
+                    ApplicationStatus.FAILED,
+                    error_message="Failed to apply to job",
                 )
+                self._log(application_id, "Failed to apply to job", "error")
 
             return success
 
         except Exception as e:
             # Handle errors
-            application["status"] = ApplicationStatus.FAILED
-            application["error_message"] = str(e)
-            application["logs"].append(
-                {
-                    "timestamp": datetime.now().isoformat(),
-                    "message": f"Error applying to job: {str(e)}",
-                    "level": "error",
-                }
+            self._set_status(
+                application_id,
+                ApplicationStatus.FAILED,
+                error_message=str(e),
             )
+            self._log(application_id, f"Error applying to job: {str(e)}", "error")
             return False
 
         finally:
-            # Update completion time
-            application["completed_at"] = datetime.now()
-            application["updated_at"] = datetime.now()
+            # Update completion time and record where the time went
+            self.jobs_db.update(
+                application_id,
+                completed_at=datetime.now(),
+                updated_at=datetime.now(),
+                job_board=job_board,
+                spans=spans.spans,
+            )
+            self.stage_timings.observe(job_board, spans.spans)
+            # The run is over, keep its log on disk only
+            self.log_store.release(application_id)
 
 
 # Singleton instance
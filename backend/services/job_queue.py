@@ -0,0 +1,263 @@
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional
+
+from database import STORAGE_BACKEND
+from models import ApplicationStatus
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Queue settings. The queue is only durable when applications are: with
+# in-memory application storage, work queued before a restart would point
+# at applications that no longer exist, so the queue is kept in memory too.
+JOB_QUEUE_PATH = os.environ.get(
+    "JOB_QUEUE_PATH",
+    os.path.join(os.getcwd(), "job_queue.db") if STORAGE_BACKEND == "sqlite" else ":memory:",
+)
+JOB_LEASE_SECONDS = float(os.environ.get("JOB_LEASE_SECONDS", "300"))
+JOB_MAX_ATTEMPTS = int(os.environ.get("JOB_MAX_ATTEMPTS", "3"))
+JOB_RETENTION_SECONDS = float(os.environ.get("JOB_RETENTION_SECONDS", "86400"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    application_id TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    enqueued_at REAL NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_id ON jobs (status, id);
+CREATE INDEX IF NOT EXISTS jobs_status_lease ON jobs (status, lease_expires);
+"""
+
+
+class QueuedJob:
+    """
+    A job claimed from the queue by a worker.
+    """
+
+    __slots__ = ("id", "kind", "application_id", "attempts")
+
+    def __init__(self, id: int, kind: str, application_id: str, attempts: int):
+        self.id = id
+        self.kind = kind
+        self.application_id = application_id
+        self.attempts = attempts
+
+
+class SQLiteJobQueue:
+    """
+    Durable job queue stored in a local SQLite database in WAL mode.
+
+    Jobs move through the ApplicationStatus states: PENDING when
+    enqueued, PROCESSING while a worker holds a lease on them, then
+    SUCCEEDED or FAILED. A lease that is not renewed expires, and the job
+    is claimed again by the next free worker, so work held by a crashed
+    process is picked up after a restart. Jobs whose lease expires after
+    `max_attempts` claims are failed by `fail_expired`.
+
+    All database access runs on a single dedicated thread so the event
+    loop never blocks on disk I/O.
+    """
+
+    def __init__(
+        self,
+        path: str = JOB_QUEUE_PATH,
+        lease_seconds: float = JOB_LEASE_SECONDS,
+        max_attempts: int = JOB_MAX_ATTEMPTS,
+    ):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="job-queue")
+        self._conn: Optional[sqlite3.Connection] = None
+
+    async def enqueue(self, kind: str, application_id: str) -> int:
+        """Add a job and return its ID."""
+        ids = await self._run(self._insert, kind, [application_id])
+        return ids[0]
+
+    async def enqueue_many(self, kind: str, application_ids: Iterable[str]) -> List[int]:
+        """Add many jobs in a single transaction and return their IDs."""
+        return await self._run(self._insert, kind, list(application_ids))
+
+    async def claim(self, worker_id: str) -> Optional[QueuedJob]:
+        """
+        Lease the oldest pending job, or a job whose lease has expired.
+        Returns None if there is nothing to do.
+        """
+        return await self._run(self._claim, worker_id)
+
+    async def fail_expired(self) -> List[QueuedJob]:
+        """
+        Fail jobs whose lease expired on their last allowed attempt and
+        return them, so their applications can be failed too.
+        """
+        return await self._run(self._fail_expired)
+
+    async def renew(self, job: QueuedJob, worker_id: str) -> bool:
+        """Extend a lease. Returns False if the lease was lost."""
+        return await self._run(self._renew, job.id, worker_id)
+
+    async def complete(self, job: QueuedJob, status: ApplicationStatus):
+        """Record the final status of a job and release its lease."""
+        await self._run(self._complete, job.id, status.value)
+
+    async def stats(self) -> Dict[str, int]:
+        """Return the number of jobs in each status."""
+        return await self._run(self._stats)
+
+    async def release(self, job: QueuedJob):
+        """Return a claimed job to the queue without counting the attempt."""
+        await self._run(self._release, job.id)
+
+    async def close(self):
+        """Close the database connection. It is reopened on next use."""
+        await self._run(self._close)
+
+    async def _run(self, fn, *args):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, fn, *args)
+
+    # The methods below only run on the queue thread
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.path, isolation_level=None)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        return self._conn
+
+    def _insert(self, kind: str, application_ids: List[str]) -> List[int]:
+        db = self._db()
+        now = time.time()
+        ids = []
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            for application_id in application_ids:
+                cursor = db.execute(
+                    "INSERT INTO jobs (kind, application_id, status, enqueued_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (kind, application_id, ApplicationStatus.PENDING.value, now, now),
+                )
+                ids.append(cursor.lastrowid)
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return ids
+
+    def _claim(self, worker_id: str) -> Optional[QueuedJob]:
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            row = db.execute(
+                "SELECT id, kind, application_id, attempts FROM jobs "
+                "WHERE status = ? ORDER BY id LIMIT 1",
+                (ApplicationStatus.PENDING.value,),
+            ).fetchone()
+            if row is None:
+                row = db.execute(
+                    "SELECT id, kind, application_id, attempts FROM jobs "
+                    "WHERE status = ? AND lease_expires < ? AND attempts < ? "
+                    "ORDER BY lease_expires LIMIT 1",
+                    (ApplicationStatus.PROCESSING.value, now, self.max_attempts),
+                ).fetchone()
+                if row is not None:
+                    logger.warning(f"Reclaiming job {row[0]} after its lease expired")
+            if row is None:
+                # Nothing to do, prune old finished jobs while idle
+                db.execute(
+                    "DELETE FROM jobs WHERE status IN (?, ?) AND updated_at < ?",
+                    (
+                        ApplicationStatus.SUCCEEDED.value,
+                        ApplicationStatus.FAILED.value,
+                        now - JOB_RETENTION_SECONDS,
+                    ),
+                )
+                db.execute("COMMIT")
+                return None
+
+            db.execute(
+                "UPDATE jobs SET status = ?, attempts = attempts + 1, lease_owner = ?, "
+                "lease_expires = ?, updated_at = ? WHERE id = ?",
+                (
+                    ApplicationStatus.PROCESSING.value,
+                    worker_id,
+                    now + self.lease_seconds,
+                    now,
+                    row[0],
+                ),
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return QueuedJob(row[0], row[1], row[2], row[3] + 1)
+
+    def _fail_expired(self) -> List[QueuedJob]:
+        db = self._db()
+        now = time.time()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            rows = db.execute(
+                "SELECT id, kind, application_id, attempts FROM jobs "
+                "WHERE status = ? AND lease_expires < ? AND attempts >= ?",
+                (ApplicationStatus.PROCESSING.value, now, self.max_attempts),
+            ).fetchall()
+            db.executemany(
+                "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, "
+                "updated_at = ? WHERE id = ?",
+                [(ApplicationStatus.FAILED.value, now, row[0]) for row in rows],
+            )
+            db.execute("COMMIT")
+        except Exception:
+            db.execute("ROLLBACK")
+            raise
+        return [QueuedJob(*row) for row in rows]
+
+    def _renew(self, job_id: int, worker_id: str) -> bool:
+        now = time.time()
+        cursor = self._db().execute(
+            "UPDATE jobs SET lease_expires = ?, updated_at = ? "
+            "WHERE id = ? AND lease_owner = ? AND status = ?",
+            (now + self.lease_seconds, now, job_id, worker_id, ApplicationStatus.PROCESSING.value),
+        )
+        return cursor.rowcount == 1
+
+    def _complete(self, job_id: int, status: str):
+        self._db().execute(
+            "UPDATE jobs SET status = ?, lease_owner = NULL, lease_expires = NULL, "
+            "updated_at = ? WHERE id = ?",
+            (status, time.time(), job_id),
+        )
+
+    def _release(self, job_id: int):
+        self._db().execute(
+            "UPDATE jobs SET status = ?, attempts = attempts - 1, lease_owner = NULL, "
+            "lease_expires = NULL, updated_at = ? WHERE id = ?",
+            (ApplicationStatus.PENDING.value, time.time(), job_id),
+        )
+
+    def _stats(self) -> Dict[str, int]:
+        rows = self._db().execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        counts = {status.value: 0 for status in ApplicationStatus}
+        counts.update(dict(rows))
+        return counts
+
+    def _close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -0,0 +1,117 @@
+import re
+from typing import Any, Dict, Iterable, Optional, Tuple
+from urllib.parse import parse_qsl, quote, unquote, urlencode, urlsplit
+
+from automation.boards import BoardRegistry, get_board_registry
+
+# Query parameters that only track where a visitor came from
+TRACKING_PARAMS = {
+    "fbclid",
+    "gclid",
+    "msclkid",
+    "mc_cid",
+    "mc_eid",
+    "_ga",
+    "ref",
+    "refid",
+    "referrer",
+    "src",
+    "source",
+    "from",
+    "trk",
+    "trkinfo",
+    "trackingid",
+    "lipi",
+    "gh_src",
+    "lever-source",
+    "lever-origin",
+    "lever-via",
+    "iis",
+    "iisn",
+}
+TRACKING_PREFIXES = ("utm_",)
+
+# Greenhouse embeds job IDs on company career sites as ?gh_jid=<id>
+GREENHOUSE_JOB_PARAM = "gh_jid"
+
+_SLASHES = re.compile(r"/{2,}")
+
+
+def canonicalize_job_url(url: str, registry: Optional[BoardRegistry] = None) -> str:
+    """
+    Reduce a job posting URL to a key shared by every URL of the posting.
+
+    The scheme, fragment, default ports, a leading "www." and tracking
+    parameters are dropped, the host is lowercased, the path's slashes
+    and percent-encoding are normalized and the remaining parameters are
+    sorted. Job board adapters then reduce known posting URLs to their
+    job IDs, so /en/jobs/123/some-title and /jobs/123 are one posting.
+    """
+    registry = registry or get_board_registry()
+    parts = urlsplit(str(url).strip())
+
+    host = (parts.hostname or "").rstrip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = _SLASHES.sub("/", quote(unquote(parts.path), safe="/:@!$&'()*+,;=~"))
+    path = path.rstrip("/")
+
+    params = sorted(
+        (name, value)
+        for name, value in parse_qsl(parts.query, keep_blank_values=True)
+        if name.lower() not in TRACKING_PARAMS and not name.lower().startswith(TRACKING_PREFIXES)
+    )
+    for name, value in params:
+        if name == GREENHOUSE_JOB_PARAM and value.isdigit():
+            return f"greenhouse.io/jobs/{value}"
+
+    location = host + path + (f"?{urlencode(params)}" if params else "")
+    return registry.lookup(host).job_key(location) or location
+
+
+class JobURLIndex:
+    """
+    Per-user index from canonical job URL to the application for it,
+    used to turn away repeat applications to one posting.
+    """
+
+    def __init__(self, registry: Optional[BoardRegistry] = None):
+        self.registry = registry
+        self._applications: Dict[Tuple[str, str], str] = {}
+
+    def canonicalize(self, url: str) -> str:
+        return canonicalize_job_url(url, self.registry)
+
+    def get(self, user_id: str, canonical_url: str) -> Optional[str]:
+        """Return the ID of the user's application for a posting, if any."""
+        return self._applications.get((user_id, canonical_url))
+
+    def add(self, user_id: str, canonical_url: str, application_id: str):
+        self._applications[(user_id, canonical_url)] = application_id
+
+    def remove(self, user_id: str, canonical_url: str, application_id: str):
+        """Drop an entry if it still points at the given application."""
+        key = (user_id, canonical_url)
+        if self._applications.get(key) == application_id:
+            del self._applications[key]
+
+    def rebuild(self, applications: Iterable[Dict[str, Any]]):
+        """
+        Index stored applications, oldest first, so the earliest
+        application for a posting wins.
+        """
+        self._applications.clear()
+        for application in applications:
+            canonical_url = application.get("canonical_url") or self.canonicalize(
+                application["job_url"]
+            )
+            self._applications.setdefault(
+                (application["user_id"], canonical_url), application["id"]
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of indexed postings."""
+        return {"postings": len(self._applications)}
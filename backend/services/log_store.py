@@ -0,0 +1,374 @@
+import asyncio
+import gzip
+import json
+import logging
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple, Union
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Log storage settings
+LOG_BUFFER_SIZE = int(os.environ.get("LOG_BUFFER_SIZE", "200"))
+LOG_SPILL_BATCH = int(os.environ.get("LOG_SPILL_BATCH", "64"))
+LOG_SPILL_DIR = os.environ.get("LOG_SPILL_DIR", os.path.join(os.getcwd(), "logs"))
+
+# Known levels share one string object per level
+LEVELS = {level: sys.intern(level) for level in ("debug", "info", "warning", "error")}
+
+
+def intern_level(level: str) -> str:
+    """Return the shared string for a log level."""
+    return LEVELS.get(level) or sys.intern(str(level))
+
+
+def _parse_timestamp(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.timestamp()
+    try:
+        return datetime.fromisoformat(str(value).replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return time.time()
+
+
+class LogRecord:
+    """
+    A single log entry: sequence number, epoch timestamp, interned level
+    and message. The sequence number is the record's position in its
+    application's log and is assigned when the record is stored.
+    """
+
+    __slots__ = ("seq", "timestamp", "level", "message")
+
+    def __init__(
+        self,
+        message: str,
+        level: str = "info",
+        timestamp: Optional[float] = None,
+        seq: int = -1,
+    ):
+        self.seq = seq
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.level = intern_level(level)
+        self.message = message
+
+    @classmethod
+    def from_dict(cls, entry: Dict[str, Any]) -> "LogRecord":
+        """Build a record from a log dict as produced by the automation service."""
+        return cls(
+            str(entry.get("message", "")),
+            entry.get("level", "info"),
+            _parse_timestamp(entry.get("timestamp", time.time())),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Render the record in the shape returned by the API."""
+        return {
+            "seq": self.seq,
+            "timestamp": datetime.fromtimestamp(self.timestamp).isoformat(),
+            "message": self.message,
+            "level": self.level,
+        }
+
+    def to_row(self) -> list:
+        return [self.seq, self.timestamp, self.level, self.message]
+
+
+def _write_segment(path: str, lines: str, count: int):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Each flush adds a gzip member; gzip readers concatenate them
+        with gzip.open(path, "at", encoding="utf-8") as segment:
+            segment.write(lines)
+    except OSError as e:
+        logger.warning(f"Dropping {count} log entries, could not spill: {str(e)}")
+
+
+def _scan_segment(path: str) -> Tuple[int, int]:
+    """
+    Return the number of records in a segment and the sequence number
+    following the last. An unreadable segment is moved aside.
+    """
+    if not os.path.exists(path):
+        return 0, 0
+    spilled = 0
+    last = None
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as segment:
+            for line in segment:
+                spilled += 1
+                last = line
+        return spilled, json.loads(last)[0] + 1 if last is not None else 0
+    except (OSError, EOFError, ValueError) as e:
+        logger.warning(f"Starting a new log segment, could not read {path}: {str(e)}")
+        os.replace(path, path + ".corrupt")
+        return 0, 0
+
+
+def _read_segment(path: str, start: int = 0, stop: Optional[int] = None) -> List[LogRecord]:
+    """Return a segment's records with sequence numbers in [start, stop)."""
+    if not os.path.exists(path):
+        return []
+    records = []
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as segment:
+            for line in segment:
+                seq, timestamp, level, message = json.loads(line)
+                if stop is not None and seq >= stop:
+                    break
+                if seq >= start:
+                    records.append(LogRecord(message, level, timestamp, seq))
+    except EOFError:
+        # The last member was cut short, e.g. by a crash while writing
+        pass
+    return records
+
+
+def _remove_segment(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+class ApplicationLog:
+    """
+    Log of one application: the newest `buffer_size` records in memory,
+    older ones appended in batches to a gzip segment on disk.
+
+    Records are addressed by sequence number, their position in the
+    log, which `append` assigns. A segment left by an earlier run or
+    released log is counted by `restore` before the first append, so
+    numbering continues. Segment reads and writes run in order on the
+    store's single I/O thread, so a read sees every earlier write.
+    Readers wait for new records on an Event that is replaced on every
+    append, so one writer wakes any number of readers.
+    """
+
+    __slots__ = ("path", "buffer", "_spill", "spilled", "count", "restored", "_io", "_changed")
+
+    def __init__(self, path: str, io: ThreadPoolExecutor, buffer_size: int = LOG_BUFFER_SIZE):
+        self.path = path
+        self.buffer: Deque[LogRecord] = deque(maxlen=max(1, buffer_size))
+        self._spill: List[LogRecord] = []
+        self.spilled = 0
+        self.count = 0
+        self.restored = False
+        self._io = io
+        self._changed: Optional[asyncio.Event] = None
+
+    def append(self, record: LogRecord):
+        if not self.restored:
+            # Not opened with LogStore.open; count the segment here
+            self.restore(*self._io.submit(_scan_segment, self.path).result())
+        if len(self.buffer) == self.buffer.maxlen:
+            self._spill.append(self.buffer[0])
+            if len(self._spill) >= LOG_SPILL_BATCH:
+                self.flush()
+        record.seq = self.count
+        self.buffer.append(record)
+        self.count += 1
+        self.notify()
+
+    def restore(self, spilled: int, count: int):
+        """Continue numbering after the records already on disk."""
+        self.spilled = spilled
+        self.count = count
+        self.restored = True
+
+    def notify(self):
+        """Wake every reader waiting for a change."""
+        if self._changed is not None:
+            changed, self._changed = self._changed, None
+            changed.set()
+
+    def changed(self) -> asyncio.Event:
+        """Return the Event set on the next append or notify."""
+        if self._changed is None:
+            self._changed = asyncio.Event()
+        return self._changed
+
+    def flush(self, include_buffer: bool = False):
+        """
+        Queue evicted records for writing to the on-disk segment, and
+        with `include_buffer` the buffered ones too.
+        """
+        if include_buffer:
+            self._spill.extend(self.buffer)
+            self.buffer.clear()
+        if not self._spill:
+            return
+        lines = "".join(json.dumps(record.to_row()) + "\n" for record in self._spill)
+        self._io.submit(_write_segment, self.path, lines, len(self._spill))
+        self.spilled += len(self._spill)
+        self._spill = []
+
+    async def records_from(self, offset: int) -> List[LogRecord]:
+        """Return the records with sequence numbers from `offset` on."""
+        in_memory = self._spill + list(self.buffer)
+        first = self.count - len(in_memory)
+        if offset >= first:
+            return in_memory[offset - first:]
+        # Only touch the on-disk segment for readers that fell behind.
+        # Records spilled meanwhile are in `in_memory`.
+        older = await asyncio.get_running_loop().run_in_executor(
+            self._io, _read_segment, self.path, max(0, offset), first
+        )
+        return older + in_memory
+
+
+class LogStore:
+    """
+    Bounded per-application log storage.
+
+    Each application keeps a ring buffer of its newest records, so memory
+    per application stays constant however chatty a page is. Records
+    pushed out of the buffer are spilled to a compressed segment in
+    `spill_dir` and are still returned when the full log is read.
+    Finished applications are released to their segment and read from
+    disk until they are appended to again. Segment I/O runs on one
+    worker thread, never on the event loop.
+    """
+
+    def __init__(self, spill_dir: str = LOG_SPILL_DIR, buffer_size: int = LOG_BUFFER_SIZE):
+        self.spill_dir = spill_dir
+        self.buffer_size = buffer_size
+        self._logs: Dict[str, ApplicationLog] = {}
+        self._io = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-segments")
+
+    def _path(self, application_id: str) -> str:
+        return os.path.join(self.spill_dir, f"{application_id}.jsonl.gz")
+
+    def _log_for(self, application_id: str) -> ApplicationLog:
+        log = self._logs.get(application_id)
+        if log is None:
+            log = self._logs[application_id] = ApplicationLog(
+                self._path(application_id), self._io, self.buffer_size
+            )
+        return log
+
+    async def open(self, application_id: str):
+        """
+        Load an application's log for appending, counting the records
+        of an existing segment off the event loop.
+        """
+        log = self._log_for(application_id)
+        if log.restored:
+            return
+        spilled, count = await asyncio.get_running_loop().run_in_executor(
+            self._io, _scan_segment, log.path
+        )
+        if not log.restored:
+            log.restore(spilled, count)
+
+    def append(self, application_id: str, message: str, level: str = "info") -> LogRecord:
+        """Add a log entry to an application and assign its sequence number."""
+        record = LogRecord(message, level)
+        self._log_for(application_id).append(record)
+        return record
+
+    def extend(
+        self,
+        application_id: str,
+        entries: Iterable[Union[LogRecord, Dict[str, Any]]],
+    ):
+        """Add records or log dicts to an application, keeping their timestamps."""
+        log = self._log_for(application_id)
+        for entry in entries:
+            log.append(entry if isinstance(entry, LogRecord) else LogRecord.from_dict(entry))
+
+    def sink(self, application_id: str) -> Callable[[LogRecord], None]:
+        """
+        Return a callable that adds records to an application's log,
+        assigning their sequence numbers.
+        """
+        return self._log_for(application_id).append
+
+    async def read_from(self, application_id: str, offset: int = 0) -> List[LogRecord]:
+        """Return an application's records with sequence numbers from `offset` on."""
+        log = self._logs.get(application_id)
+        if log is None or not log.restored:
+            # Released or not yet loaded, the segment holds the whole log
+            return await asyncio.get_running_loop().run_in_executor(
+                self._io, _read_segment, self._path(application_id), max(0, offset)
+            )
+        return await log.records_from(offset)
+
+    def changed(self, application_id: str) -> asyncio.Event:
+        """Return the Event set when an application's log next changes."""
+        return self._log_for(application_id).changed()
+
+    def notify(self, application_id: str):
+        """Wake readers of an application, e.g. after a status change."""
+        log = self._logs.get(application_id)
+        if log is not None:
+            log.notify()
+
+    def release(self, application_id: str):
+        """
+        Write a finished application's log to its segment and drop it
+        from memory. It is read back from the segment on next use.
+        """
+        log = self._logs.pop(application_id, None)
+        if log is not None:
+            log.flush(include_buffer=True)
+            log.notify()
+
+    def discard_idle(self, application_id: str):
+        """
+        Drop a log that was only waited on and never loaded for appending,
+        e.g. after streaming a finished application.
+        """
+        log = self._logs.get(application_id)
+        if log is not None and not log.restored:
+            del self._logs[application_id]
+            log.notify()
+
+    def delete(self, application_id: str):
+        """Drop an application's log and its on-disk segment."""
+        log = self._logs.pop(application_id, None)
+        if log is not None:
+            log.notify()
+        self._io.submit(_remove_segment, self._path(application_id))
+
+    def flush(self, include_buffer: bool = False):
+        """
+        Queue every pending spilled record for writing, and with
+        `include_buffer` every buffered one.
+        """
+        for log in self._logs.values():
+            log.flush(include_buffer)
+
+    async def close(self):
+        """Write every buffered record to disk and wait for the writes."""
+        self.flush(include_buffer=True)
+        await asyncio.get_running_loop().run_in_executor(self._io, lambda: None)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return buffer occupancy and spill counters."""
+        return {
+            "applications": len(self._logs),
+            "buffer_size": self.buffer_size,
+            "buffered": sum(len(log.buffer) for log in self._logs.values()),
+            "spilled": sum(log.spilled for log in self._logs.values()),
+        }
+
+
+# Singleton instance
+log_store = None
+
+
+def get_log_store() -> LogStore:
+    """
+    Get or create the LogStore singleton instance.
+    """
+    global log_store
+    if log_store is None:
+        log_store = LogStore()
+    return log_store
@@ -0,0 +1,104 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+from passlib.context import CryptContext
+
+# Threads running bcrypt; bcrypt releases the GIL while hashing
+PASSWORD_HASH_WORKERS = int(os.environ.get("PASSWORD_HASH_WORKERS", "2"))
+# Hash operations allowed to be queued or running at once
+PASSWORD_HASH_CONCURRENCY = int(os.environ.get("PASSWORD_HASH_CONCURRENCY", "16"))
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a dedicated thread pool so
+    slow hashes never block the event loop.
+
+    At most `concurrency` operations are submitted at a time; further
+    callers wait their turn. Each operation records how long it waited
+    before a thread picked it up and how long the hash itself took.
+    """
+
+    def __init__(
+        self,
+        context: CryptContext,
+        workers: int = PASSWORD_HASH_WORKERS,
+        concurrency: int = PASSWORD_HASH_CONCURRENCY,
+    ):
+        self.context = context
+        self.workers = max(1, workers)
+        self.concurrency = max(1, concurrency)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.workers, thread_name_prefix="password-hash"
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending = 0
+        self._running = 0
+        self._running_lock = threading.Lock()
+        self._operations = 0
+        self._queue_wait_total = 0.0
+        self._queue_wait_max = 0.0
+        self._hash_time_total = 0.0
+        self._hash_time_max = 0.0
+
+    async def hash(self, password: str) -> str:
+        """Hash a password."""
+        return await self._run(self.context.hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Check a password against a stored hash."""
+        return await self._run(self.context.verify, plain_password, hashed_password)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return pool usage and timing counters, in seconds."""
+        operations = self._operations or 1
+        return {
+            "workers": self.workers,
+            "concurrency": self.concurrency,
+            "waiting": self._pending - self._running,
+            "running": self._running,
+            "operations": self._operations,
+            "queue_wait_avg": self._queue_wait_total / operations,
+            "queue_wait_max": self._queue_wait_max,
+            "hash_time_avg": self._hash_time_total / operations,
+            "hash_time_max": self._hash_time_max,
+        }
+
+    async def _run(self, fn: Callable, *args):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        submitted = time.perf_counter()
+        self._pending += 1
+        try:
+            async with self._semaphore:
+                loop = asyncio.get_running_loop()
+                result, started, finished = await loop.run_in_executor(
+                    self._executor, self._timed, fn, args
+                )
+        finally:
+            self._pending -= 1
+
+        queue_wait = started - submitted
+        hash_time = finished - started
+        self._operations += 1
+        self._queue_wait_total += queue_wait
+        self._queue_wait_max = max(self._queue_wait_max, queue_wait)
+        self._hash_time_total += hash_time
+        self._hash_time_max = max(self._hash_time_max, hash_time)
+        return result
+
+    def _timed(self, fn: Callable, args: tuple):
+        # Runs on a pool thread
+        started = time.perf_counter()
+        with self._running_lock:
+            self._running += 1
+        try:
+            result = fn(*args)
+        finally:
+            with self._running_lock:
+                self._running -= 1
+        return result, started, time.perf_counter()
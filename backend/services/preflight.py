@@ -0,0 +1,295 @@
+import asyncio
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from models import PostingStatus
+from services.job_urls import canonicalize_job_url
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pre-flight settings. Set PREFLIGHT_ENABLED to "false" to send every
+# application straight to the browser.
+PREFLIGHT_ENABLED = os.environ.get("PREFLIGHT_ENABLED", "true").lower() != "false"
+PREFLIGHT_TIMEOUT = aiohttp.ClientTimeout(
+    total=float(os.environ.get("PREFLIGHT_TIMEOUT", "8")), connect=3, sock_connect=3
+)
+PREFLIGHT_MAX_REDIRECTS = 10
+PREFLIGHT_CACHE_TTL = float(os.environ.get("PREFLIGHT_CACHE_TTL", "1800"))
+PREFLIGHT_CACHE_SIZE = int(os.environ.get("PREFLIGHT_CACHE_SIZE", "10000"))
+PREFLIGHT_POOL_LIMIT = int(os.environ.get("PREFLIGHT_POOL_LIMIT", "32"))
+PREFLIGHT_POOL_LIMIT_PER_HOST = int(os.environ.get("PREFLIGHT_POOL_LIMIT_PER_HOST", "4"))
+
+# Only the start of a page is read when looking for closed markers
+PREFLIGHT_MAX_BYTES = 256 * 1024
+
+PREFLIGHT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/121.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+}
+
+# Text job boards show on postings that no longer take applications
+CLOSED_MARKERS = re.compile(
+    r"no longer (?:available|accepting applications|open|active)"
+    r"|(?:job|position|posting|requisition) (?:has been|is|was) (?:closed|filled|expired|removed)"
+    r"|this job (?:has )?expired"
+    r"|job (?:posting )?not found",
+    re.IGNORECASE,
+)
+
+# Login and single sign-on pages, matched against "host/path"
+LOGIN_HOST_LABELS = {"login", "signin", "account", "accounts", "auth", "sso", "passport", "idp"}
+LOGIN_PATH = re.compile(
+    r"/(?:login|signin|sign-in|sign_in|logon|authwall|uas/login|checkpoint|oauth2?|sso)(?:[/?.]|$)",
+    re.IGNORECASE,
+)
+PASSWORD_INPUT = re.compile(r"<input[^>]+type=[\"']?password", re.IGNORECASE)
+
+# Statuses that say nothing about the posting, such as bot protection
+INCONCLUSIVE_STATUSES = {403, 408, 425, 429}
+
+
+class PreflightResult:
+    """
+    What fetching a job URL said about the posting.
+    """
+
+    __slots__ = ("status", "reason", "final_url", "http_status", "checked_at")
+
+    def __init__(
+        self,
+        status: PostingStatus,
+        reason: str,
+        final_url: Optional[str] = None,
+        http_status: Optional[int] = None,
+    ):
+        self.status = status
+        self.reason = reason
+        self.final_url = final_url
+        self.http_status = http_status
+        self.checked_at = time.time()
+
+    @property
+    def proceed(self) -> bool:
+        """Whether the posting should be handed to the browser."""
+        return self.status in (PostingStatus.LIVE, PostingStatus.UNKNOWN)
+
+
+def _is_login(url: str) -> bool:
+    parts = urlsplit(url)
+    if (parts.hostname or "").split(".", 1)[0] in LOGIN_HOST_LABELS:
+        return True
+    return bool(LOGIN_PATH.search(parts.path))
+
+
+def _left_posting(job_url: str, final_url: str) -> bool:
+    """
+    Whether a redirect left the posting for a board's home, search or
+    error page. A posting that moved to another posting is still live.
+    """
+    if canonicalize_job_url(final_url) == canonicalize_job_url(job_url):
+        return False
+    parts = urlsplit(final_url)
+    return (
+        parts.path.strip("/") == ""
+        or "search" in parts.path.lower()
+        or "error" in parts.query.lower()
+    )
+
+
+def classify(
+    job_url: str, final_url: str, http_status: int, redirected: bool, body: str
+) -> PreflightResult:
+    """
+    Classify a fetched job URL from its final URL, status and the start
+    of its body.
+    """
+    login = http_status == 401 or _is_login(final_url)
+    if redirected and PASSWORD_INPUT.search(body):
+        login = True
+
+    if http_status in (404, 410):
+        status, reason = PostingStatus.CLOSED, f"Job posting returned HTTP {http_status}"
+    elif login:
+        status, reason = PostingStatus.LOGIN_WALLED, f"Job posting requires signing in: {final_url}"
+    elif http_status in INCONCLUSIVE_STATUSES or http_status >= 500:
+        status, reason = PostingStatus.UNKNOWN, f"Pre-flight check got HTTP {http_status}"
+    elif http_status >= 400:
+        status, reason = PostingStatus.CLOSED, f"Job posting returned HTTP {http_status}"
+    elif CLOSED_MARKERS.search(body):
+        status, reason = PostingStatus.CLOSED, "Job posting is no longer available"
+    elif redirected and _left_posting(job_url, final_url):
+        status, reason = PostingStatus.REDIRECTED, f"Job posting redirects to {final_url}"
+    else:
+        status, reason = PostingStatus.LIVE, "Job posting is live"
+    return PreflightResult(status, reason, final_url, http_status)
+
+
+async def _read_start(response: aiohttp.ClientResponse) -> str:
+    """
+    Read up to PREFLIGHT_MAX_BYTES of a response body and decode it.
+    """
+    chunks = []
+    size = 0
+    async for chunk in response.content.iter_chunked(PREFLIGHT_MAX_BYTES):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= PREFLIGHT_MAX_BYTES:
+            break
+    raw = b"".join(chunks)[:PREFLIGHT_MAX_BYTES]
+    try:
+        encoding = response.get_encoding()
+        return raw.decode(encoding, errors="replace")
+    except (LookupError, RuntimeError):
+        # Unknown charsets, or no charset before the body is read
+        return raw.decode("utf-8", errors="replace")
+
+
+class PreflightChecker:
+    """
+    Checks that job postings are still open before a browser is spent
+    on them.
+
+    Each URL is fetched once over a pooled aiohttp session, following
+    redirects with a short timeout, and classified as live, closed,
+    redirected or login-walled. Conclusive verdicts are cached per
+    canonical job URL for `ttl` seconds, and concurrent checks of one
+    posting share a single fetch. Timeouts, connection errors and
+    bot-protection responses are inconclusive and are not cached.
+    """
+
+    def __init__(
+        self,
+        enabled: bool = PREFLIGHT_ENABLED,
+        ttl: float = PREFLIGHT_CACHE_TTL,
+        max_size: int = PREFLIGHT_CACHE_SIZE,
+        limit: int = PREFLIGHT_POOL_LIMIT,
+        limit_per_host: int = PREFLIGHT_POOL_LIMIT_PER_HOST,
+    ):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.max_size = max(1, max_size)
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._cache: "OrderedDict[str, PreflightResult]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[PreflightResult]"] = {}
+        self._checks = 0
+        self._hits = 0
+        self._verdicts: Dict[str, int] = {}
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared session, creating it on first use.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector, headers=PREFLIGHT_HEADERS, timeout=PREFLIGHT_TIMEOUT
+            )
+        return self._session
+
+    async def close(self):
+        """
+        Close the shared session and its connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    async def check(self, job_url: str) -> PreflightResult:
+        """Return the verdict for a job URL, from the cache when fresh."""
+        if not self.enabled:
+            return PreflightResult(PostingStatus.UNKNOWN, "Pre-flight check disabled")
+
+        key = canonicalize_job_url(job_url)
+        cached = self._cache.get(key)
+        if cached is not None:
+            if time.time() - cached.checked_at < self.ttl:
+                self._cache.move_to_end(key)
+                self._hits += 1
+                return cached
+            del self._cache[key]
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self._hits += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await self._fetch(job_url)
+            future.set_result(result)
+        finally:
+            del self._inflight[key]
+            if not future.done():
+                # This check was cancelled, callers sharing it go ahead
+                future.set_result(
+                    PreflightResult(PostingStatus.UNKNOWN, "Pre-flight check cancelled")
+                )
+
+        self._checks += 1
+        self._verdicts[result.status.value] = self._verdicts.get(result.status.value, 0) + 1
+        if result.status != PostingStatus.UNKNOWN:
+            self._cache[key] = result
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return result
+
+    async def _fetch(self, job_url: str) -> PreflightResult:
+        try:
+            async with self._get_session().get(
+                job_url, allow_redirects=True, max_redirects=PREFLIGHT_MAX_REDIRECTS
+            ) as response:
+                body = ""
+                if "html" in response.headers.get("Content-Type", "html"):
+                    body = await _read_start(response)
+                return classify(
+                    job_url, str(response.url), response.status, bool(response.history), body
+                )
+        except aiohttp.TooManyRedirects:
+            return PreflightResult(PostingStatus.REDIRECTED, "Job posting redirects in a loop")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.info(f"Pre-flight check of {job_url} inconclusive: {e!r}")
+            return PreflightResult(PostingStatus.UNKNOWN, f"Pre-flight check failed: {e!r}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return check counts by verdict and cache usage."""
+        return {
+            "enabled": self.enabled,
+            "checks": self._checks,
+            "cache_hits": self._hits,
+            "cache_size": len(self._cache),
+            "verdicts": dict(self._verdicts),
+        }
+
+
+# Singleton instance
+preflight_checker = None
+
+
+def get_preflight_checker() -> PreflightChecker:
+    """
+    Get or create the PreflightChecker singleton instance.
+    """
+    global preflight_checker
+    if preflight_checker is None:
+        preflight_checker = PreflightChecker()
+    return preflight_checker
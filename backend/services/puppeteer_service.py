@@ -5,31 +5,111 @@ import json
 from typing import Dict, Any, List, Optional
 from datetime import datetime
 
+from models import FillPlan
+from services.timing import SpanRecorder
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Connection pool settings
+PUPPETEER_POOL_LIMIT = int(os.environ.get("PUPPETEER_POOL_LIMIT", "32"))
+PUPPETEER_POOL_LIMIT_PER_HOST = int(os.environ.get("PUPPETEER_POOL_LIMIT_PER_HOST", "16"))
+PUPPETEER_KEEPALIVE_SECONDS = float(os.environ.get("PUPPETEER_KEEPALIVE_SECONDS", "60"))
+
+# Per-phase timeouts. An application can keep the automation service busy
+# for minutes, so only connecting is expected to be quick.
+APPLY_TIMEOUT = aiohttp.ClientTimeout(
+    total=float(os.environ.get("PUPPETEER_APPLY_TIMEOUT", "600")),
+    connect=5,
+    sock_connect=5,
+    sock_read=float(os.environ.get("PUPPETEER_APPLY_TIMEOUT", "600")),
+)
+HEALTH_TIMEOUT = aiohttp.ClientTimeout(total=5, connect=2, sock_connect=2, sock_read=3)
+
 class PuppeteerService:
     """
     Service to communicate with the Puppeteer automation service.
+    All requests share one long-lived aiohttp session, so connections to
+    the automation service are kept alive and reused between applications.
     """
     
-    def __init__(self, base_url: str = None):
+    def __init__(
+        self,
+        base_url: str = None,
+        limit: int = PUPPETEER_POOL_LIMIT,
+        limit_per_host: int = PUPPETEER_POOL_LIMIT_PER_HOST,
+        keepalive_timeout: float = PUPPETEER_KEEPALIVE_SECONDS,
+    ):
         """
         Initialize the Puppeteer service.
         
         Args:
             base_url: The base URL of the Puppeteer automation service.
+            limit: Maximum number of open connections.
+            limit_per_host: Maximum number of open connections per host.
+            keepalive_timeout: Seconds an idle connection is kept open.
         """
         # Use environment variable if provided, otherwise default to localhost
         self.base_url = base_url or os.environ.get("PUPPETEER_SERVICE_URL", "http://localhost:3001")
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.keepalive_timeout = keepalive_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._requests = 0
+        self._errors = 0
         logger.info(f"Initializing PuppeteerService with base_url: {self.base_url}")
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Return the shared session, creating it on first use.
+        """
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300,
+            )
+            self._session = aiohttp.ClientSession(connector=connector)
+        return self._session
+
+    async def close(self):
+        """
+        Close the shared session and its connections.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def pool_stats(self) -> Dict[str, Any]:
+        """
+        Return connection pool usage, for sizing the pool limits.
+        """
+        stats = {
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "requests": self._requests,
+            "errors": self._errors,
+            "open": False,
+            "in_use": 0,
+            "idle": 0,
+        }
+        if self._session is not None and not self._session.closed:
+            connector = self._session.connector
+            stats["open"] = True
+            # aiohttp exposes no public counters for pooled connections
+            stats["in_use"] = len(getattr(connector, "_acquired", ()))
+            stats["idle"] = sum(len(conns) for conns in getattr(connector, "_conns", {}).values())
+        return stats
         
     async def apply_to_job(
         self, 
         job_url: str, 
         resume_path: str, 
-        resume_data: Dict[str, Any]
+        resume_data: Dict[str, Any],
+        fill_plan: Optional[FillPlan] = None,
+        spans: Optional[SpanRecorder] = None
     ) -> tuple[bool, List[Dict[str, Any]]]:
         """
         Apply to a job using the Puppeteer automation service.
@@ -38,37 +118,55 @@ class PuppeteerService:
             job_url: The URL of the job to apply to.
             resume_path: The path to the resume file.
             resume_data: Structured resume data.
+            fill_plan: The resume's precompiled fill plan, whose selectors
+                the service fills instead of deriving its own.
+            spans: Recorder the stage timings reported by the service
+                are added to.
             
         Returns:
             Tuple of (success, logs)
         """
+        self._requests += 1
         try:
-            async with aiohttp.ClientSession() as session:
-                url = f"{self.base_url}/api/apply"
-                payload = {
-                    "jobUrl": job_url,
-                    "resumePath": resume_path,
-                    "resumeData": resume_data
-                }
-                
-                logger.info(f"Sending request to Puppeteer service: {url}")
-                logger.info(f"Job URL: {job_url}")
-                logger.info(f"Resume path: {resume_path}")
+            session = self._get_session()
+            url = f"{self.base_url}/api/apply"
+            payload = {
+                "jobUrl": job_url,
+                "resumePath": resume_path,
+                "resumeData": resume_data
+            }
+            if fill_plan is not None:
+                payload["fillPlan"] = {"selectors": fill_plan.selectors}
+            
+            logger.info(f"Sending request to Puppeteer service: {url}")
+            logger.info(f"Job URL: {job_url}")
+            logger.info(f"Resume path: {resume_path}")
+            
+            async with session.post(url, json=payload, timeout=APPLY_TIMEOUT) as response:
+                if response.status != 200:
+                    self._errors += 1
+                    error_text = await response.text()
+                    logger.error(f"Error from Puppeteer service: {error_text}")
+                    return False, [{
+                        "timestamp": datetime.now().isoformat(),
+                        "message": f"Error from automation service: {error_text}",
+                        "level": "error"
+                    }]
                 
-                async with session.post(url, json=payload) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        logger.error(f"Error from Puppeteer service: {error_text}")
-                        return False, [{
-                            "timestamp": datetime.now().isoformat(),
-                            "message": f"Error from automation service: {error_text}",
-                            "level": "error"
-                        }]
-                    
-                    result = await response.json()
-                    return result["success"], result["logs"]
+                result = await response.json()
+                if spans is not None:
+                    for span in result.get("spans", []):
+                        # Reported in UTC, stored as local time like our own spans
+                        started_at = datetime.fromisoformat(
+                            span["startedAt"].replace("Z", "+00:00")
+                        ).astimezone().replace(tzinfo=None)
+                        spans.add(
+                            span["stage"], started_at, span["durationMs"], span.get("ok", True)
+                        )
+                return result["success"], result["logs"]
                     
         except Exception as e:
+            self._errors += 1
             logger.error(f"Error communicating with Puppeteer service: {str(e)}")
             return False, [{
                 "timestamp": datetime.now().isoformat(),
@@ -83,9 +181,13 @@ class PuppeteerService:
         Returns:
             True if the service is healthy, False otherwise.
         """
+        self._requests += 1
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.get(f"{self.base_url}/api/health") as response:
-                    return response.status == 200
+            session = self._get_session()
+            async with session.get(
+                f"{self.base_url}/api/health", timeout=HEALTH_TIMEOUT
+            ) as response:
+                return response.status == 200
         except Exception:
+            self._errors += 1
             return False
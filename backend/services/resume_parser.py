@@ -0,0 +1,321 @@
+import asyncio
+import logging
+import os
+import re
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, List, Optional
+
+from PyPDF2 import PdfReader
+
+from automation.form_discovery import compile_fill_plan
+from database import Repository
+from models import FillPlan, ResumeData
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Parser settings
+RESUME_PARSE_WORKERS = int(os.environ.get("RESUME_PARSE_WORKERS", "2"))
+RESUME_PARSE_CACHE_SIZE = int(os.environ.get("RESUME_PARSE_CACHE_SIZE", "1000"))
+FILL_PLAN_CACHE_SIZE = int(os.environ.get("FILL_PLAN_CACHE_SIZE", "1000"))
+
+# Section headings, matched case-insensitively against whole lines
+SECTION_HEADINGS = {
+    "summary": ("summary", "professional summary", "profile", "about", "about me", "objective"),
+    "core_experience": (
+        "experience",
+        "core experience",
+        "work experience",
+        "professional experience",
+        "employment",
+        "employment history",
+        "work history",
+    ),
+    "education": ("education", "academic background", "education and training"),
+    "skills": ("skills", "technical skills", "core skills", "core competencies", "technologies"),
+    "portfolio": ("portfolio", "links", "online presence"),
+    "contact_info": ("contact", "contact info", "contact information"),
+}
+HEADING_TO_SECTION = {
+    heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings
+}
+
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# Phone candidates stay on one line; they are then checked for shape
+PHONE_PATTERN = re.compile(r"\+?\(?\d[\d \t().-]{7,}\d")
+PHONE_DIGITS = (10, 15)
+# Dates such as "2016 - 2020" that look like digit runs
+YEAR_RUN_PATTERN = re.compile(r"(?:(?:19|20)\d{2}[\s().-]*)+")
+# A URL needs a scheme, a "www." prefix or a path after a known TLD, so
+# words like "ASP.NET" or "Node.js" are not read as links
+URL_PATTERN = re.compile(
+    r"(?i:https?://)[^\s<>\"']+"
+    r"|(?i:www\.)[\w-]+(?:\.[\w-]+)+(?:/[\w./?=&%#-]*)?"
+    r"|\b[\w-]+(?:\.[\w-]+)*\.(?:com|io|dev|me|org|net|video|co)/[\w./?=&%#-]+"
+)
+BULLET_PATTERN = re.compile(r"^[-*•▪●–]\s*")
+SKILL_SEPARATORS = re.compile(r"[,;|•·]|\s{2,}")
+
+
+def _heading(line: str) -> Optional[str]:
+    key = line.strip().rstrip(":").strip().lower()
+    return HEADING_TO_SECTION.get(key)
+
+
+def _find_phone(text: str) -> Optional[str]:
+    """Return the first phone-shaped number, skipping runs of years."""
+    for match in PHONE_PATTERN.finditer(text):
+        candidate = match.group(0).strip()
+        digits = sum(char.isdigit() for char in candidate)
+        if not PHONE_DIGITS[0] <= digits <= PHONE_DIGITS[1]:
+            continue
+        if YEAR_RUN_PATTERN.fullmatch(candidate):
+            continue
+        return candidate
+    return None
+
+
+def _portfolio_key(url: str) -> str:
+    lowered = url.lower()
+    for site in ("github", "linkedin", "twitter", "gitlab", "behance", "dribbble"):
+        if site in lowered:
+            return site
+    return "website"
+
+
+def parse_resume_text(text: str) -> Dict[str, Any]:
+    """
+    Split resume text into sections and extract ResumeData fields.
+    The first lines before any section heading are read as the name and
+    title; contact details and links are collected from the whole text.
+    """
+    lines = [line.strip() for line in text.splitlines()]
+    lines = [line for line in lines if line]
+    if not lines:
+        raise ValueError("No text could be extracted from the resume")
+
+    header: List[str] = []
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for line in lines:
+        section = _heading(line)
+        if section:
+            current = section
+            sections.setdefault(section, [])
+        elif current is None:
+            header.append(line)
+        else:
+            sections[current].append(line)
+
+    # Name and title are the first header lines that are not contact details
+    identity = [
+        line
+        for line in header
+        if not EMAIL_PATTERN.search(line) and not URL_PATTERN.fullmatch(line)
+    ]
+    name = identity[0] if identity else lines[0]
+    title = identity[1] if len(identity) > 1 else ""
+
+    summary_lines = sections.get("summary") or identity[2:]
+    summary = " ".join(BULLET_PATTERN.sub("", line) for line in summary_lines)
+
+    # Experience entries are the non-bullet lines: "Company, Role"
+    experience_lines = sections.get("core_experience", [])
+    core_experience = [line for line in experience_lines if not BULLET_PATTERN.match(line)]
+    if not core_experience:
+        core_experience = [BULLET_PATTERN.sub("", line) for line in experience_lines]
+
+    education = [BULLET_PATTERN.sub("", line) for line in sections.get("education", [])]
+
+    skills = []
+    for line in sections.get("skills", []):
+        for skill in SKILL_SEPARATORS.split(BULLET_PATTERN.sub("", line)):
+            skill = skill.strip()
+            if skill and skill not in skills:
+                skills.append(skill)
+
+    contact_info: Dict[str, str] = {}
+    email = EMAIL_PATTERN.search(text)
+    if email:
+        contact_info["email"] = email.group(0)
+    phone = _find_phone(text)
+    if phone:
+        contact_info["phone"] = phone
+
+    portfolio: Dict[str, str] = {}
+    text_without_emails = EMAIL_PATTERN.sub(" ", text)
+    for match in URL_PATTERN.finditer(text_without_emails):
+        url = match.group(0).rstrip(".,;:)/")
+        portfolio.setdefault(_portfolio_key(url), url)
+
+    return {
+        "name": name,
+        "title": title,
+        "summary": summary,
+        "core_experience": core_experience,
+        "education": education,
+        "portfolio": portfolio,
+        "contact_info": contact_info,
+        "skills": skills or None,
+    }
+
+
+def parse_resume_file(file_path: str) -> Dict[str, Any]:
+    """
+    Extract the text of a PDF and parse it into ResumeData fields.
+    Runs in a worker process.
+    """
+    reader = PdfReader(file_path)
+    text = "\n".join(page.extract_text() or "" for page in reader.pages)
+    return parse_resume_text(text)
+
+
+class ResumeParser:
+    """
+    Parses resume PDFs in a process pool, so CPU-bound text extraction
+    never runs on the event loop.
+
+    Results are cached by file content hash in a bounded LRU, and
+    concurrent requests for the same content share one parse.
+    """
+
+    def __init__(
+        self,
+        workers: int = RESUME_PARSE_WORKERS,
+        cache_size: int = RESUME_PARSE_CACHE_SIZE,
+    ):
+        self.workers = max(1, workers)
+        self.cache_size = max(1, cache_size)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._cache: "OrderedDict[str, ResumeData]" = OrderedDict()
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self._hits = 0
+        self._parses = 0
+        self._failures = 0
+
+    def cached(self, content_hash: str) -> Optional[ResumeData]:
+        """Return the cached result for a content hash, if any."""
+        parsed = self._cache.get(content_hash)
+        if parsed is not None:
+            self._cache.move_to_end(content_hash)
+            self._hits += 1
+        return parsed
+
+    def seed(self, resumes: Iterable[Dict[str, Any]]):
+        """Fill the cache from stored resumes that were already parsed."""
+        for resume in resumes:
+            if resume.get("content_hash") and resume.get("parsed_data") is not None:
+                self._store(resume["content_hash"], ResumeData(**resume["parsed_data"]))
+
+    async def parse(self, content_hash: str, file_path: str, force: bool = False) -> ResumeData:
+        """
+        Parse a resume file, returning the cached result for its content
+        unless `force` is set.
+        """
+        if not force:
+            parsed = self.cached(content_hash)
+            if parsed is not None:
+                return parsed
+
+        in_flight = self._in_flight.get(content_hash)
+        if in_flight is not None:
+            return await asyncio.shield(in_flight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[content_hash] = future
+        try:
+            parsed = await self._run(file_path)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            self._failures += 1
+            future.set_exception(e)
+            # Retrieve the exception so it is not logged when nobody waits
+            future.exception()
+            raise
+        else:
+            self._store(content_hash, parsed)
+            future.set_result(parsed)
+            return parsed
+        finally:
+            del self._in_flight[content_hash]
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache and parse counters."""
+        return {
+            "workers": self.workers,
+            "cached": len(self._cache),
+            "in_flight": len(self._in_flight),
+            "cache_hits": self._hits,
+            "parses": self._parses,
+            "failures": self._failures,
+        }
+
+    async def _run(self, file_path: str) -> ResumeData:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.workers)
+        loop = asyncio.get_running_loop()
+        self._parses += 1
+        fields = await loop.run_in_executor(self._executor, parse_resume_file, file_path)
+        return ResumeData(**fields)
+
+    def _store(self, content_hash: str, parsed: ResumeData):
+        self._cache[content_hash] = parsed
+        self._cache.move_to_end(content_hash)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+# Built fill plans by resume ID, dropped when a resume is reparsed or deleted
+_fill_plans: "OrderedDict[str, FillPlan]" = OrderedDict()
+
+
+def get_fill_plan(resumes_db: Repository, resume: Dict[str, Any]) -> Optional[FillPlan]:
+    """
+    Return a resume's stored fill plan. Plans are compiled when a resume
+    is parsed; resumes parsed before that get theirs compiled and stored
+    on first use. Returns None for resumes that are not parsed.
+    """
+    fill_plan = _fill_plans.get(resume["id"])
+    if fill_plan is not None:
+        _fill_plans.move_to_end(resume["id"])
+        return fill_plan
+    if resume.get("fill_plan") is not None:
+        fill_plan = FillPlan(**resume["fill_plan"])
+    elif resume.get("parsed_data") is not None:
+        fill_plan = compile_fill_plan(ResumeData(**resume["parsed_data"]))
+        resumes_db.update(resume["id"], fill_plan=fill_plan.dict())
+    else:
+        return None
+    _fill_plans[resume["id"]] = fill_plan
+    while len(_fill_plans) > max(1, FILL_PLAN_CACHE_SIZE):
+        _fill_plans.popitem(last=False)
+    return fill_plan
+
+
+def forget_fill_plan(resume_id: str):
+    """Drop a deleted resume's built fill plan."""
+    _fill_plans.pop(resume_id, None)
+
+
+# Singleton instance
+resume_parser = None
+
+
+def get_resume_parser() -> ResumeParser:
+    """
+    Get or create the ResumeParser singleton instance.
+    """
+    global resume_parser
+    if resume_parser is None:
+        resume_parser = ResumeParser()
+    return resume_parser
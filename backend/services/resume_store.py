@@ -0,0 +1,151 @@
+import asyncio
+import hashlib
+import logging
+import os
+import uuid
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Iterable, List
+
+import aiofiles
+import aiofiles.os
+from fastapi import UploadFile
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Upload settings
+RESUME_MAX_BYTES = int(os.environ.get("RESUME_MAX_BYTES", str(10 * 1024 * 1024)))
+UPLOAD_CHUNK_BYTES = 64 * 1024
+
+
+class ResumeTooLargeError(ValueError):
+    """Raised when an upload exceeds the size limit."""
+
+
+class StoredFile:
+    """
+    A resume file stored under its content hash.
+    """
+
+    __slots__ = ("content_hash", "path", "size")
+
+    def __init__(self, content_hash: str, path: str, size: int):
+        self.content_hash = content_hash
+        self.path = path
+        self.size = size
+
+
+class ResumeFileStore:
+    """
+    Content-addressed storage for uploaded resume files.
+
+    Uploads are streamed to disk in chunks with aiofiles and hashed with
+    SHA-256 while they are written. The file is then stored as
+    `<sha256>.pdf`, so identical uploads share one file. Files are
+    reference counted by the resumes that use them and removed with the
+    last one. Saving and releasing one content hash hold its lock, so a
+    save never takes a reference to a file that is being removed.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = RESUME_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._refs: Dict[str, int] = {}
+        # Lock and number of holders or waiters per content hash
+        self._locks: Dict[str, List[Any]] = {}
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, content_hash: str) -> str:
+        return os.path.join(self.directory, f"{content_hash}.pdf")
+
+    async def save(self, upload: UploadFile) -> StoredFile:
+        """
+        Stream an upload to disk, store it by content hash and take a
+        reference to the stored file for the new resume.
+        Raises ResumeTooLargeError as soon as the limit is exceeded.
+        """
+        if upload.size is not None and upload.size > self.max_bytes:
+            raise ResumeTooLargeError(f"Resume exceeds {self.max_bytes} bytes")
+
+        digest = hashlib.sha256()
+        size = 0
+        partial_path = os.path.join(self.directory, f".{uuid.uuid4()}.part")
+        try:
+            async with aiofiles.open(partial_path, "wb") as out:
+                while True:
+                    chunk = await upload.read(UPLOAD_CHUNK_BYTES)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > self.max_bytes:
+                        raise ResumeTooLargeError(f"Resume exceeds {self.max_bytes} bytes")
+                    digest.update(chunk)
+                    await out.write(chunk)
+        except BaseException:
+            await self._remove(partial_path)
+            raise
+
+        content_hash = digest.hexdigest()
+        path = self.path_for(content_hash)
+        async with self._locked(content_hash):
+            if os.path.exists(path):
+                await self._remove(partial_path)
+            else:
+                await aiofiles.os.replace(partial_path, path)
+            self.acquire(content_hash)
+        return StoredFile(content_hash, path, size)
+
+    def acquire(self, content_hash: str):
+        """Record a resume referencing a stored file."""
+        self._refs[content_hash] = self._refs.get(content_hash, 0) + 1
+
+    async def release(self, content_hash: str):
+        """
+        Drop a resume's reference to a stored file, removing the file
+        with the last reference.
+        """
+        async with self._locked(content_hash):
+            remaining = self._refs.get(content_hash, 0) - 1
+            if remaining > 0:
+                self._refs[content_hash] = remaining
+                return
+            self._refs.pop(content_hash, None)
+            await self._remove(self.path_for(content_hash))
+
+    def rebuild(self, resumes: Iterable[Dict[str, Any]]):
+        """Recount references from stored resumes."""
+        self._refs.clear()
+        for resume in resumes:
+            if resume.get("content_hash"):
+                self.acquire(resume["content_hash"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of stored files and references to them."""
+        return {
+            "files": len(self._refs),
+            "references": sum(self._refs.values()),
+        }
+
+    @asynccontextmanager
+    async def _locked(self, content_hash: str):
+        """Hold the lock of a content hash, dropping it once unused."""
+        entry = self._locks.get(content_hash)
+        if entry is None:
+            entry = self._locks[content_hash] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                del self._locks[content_hash]
+
+    async def _remove(self, path: str):
+        try:
+            await aiofiles.os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logger.warning(f"Could not remove {path}: {str(e)}")
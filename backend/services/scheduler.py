@@ -0,0 +1,245 @@
+import asyncio
+import logging
+import os
+import uuid
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+from models import ApplicationStatus
+from services.job_queue import QueuedJob, SQLiteJobQueue
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Number of applications processed at the same time
+APPLICATION_WORKERS = int(os.environ.get("APPLICATION_WORKERS", "4"))
+
+# Seconds an idle worker waits before checking for expired leases
+IDLE_POLL_SECONDS = 5.0
+
+
+class SchedulerClosedError(RuntimeError):
+    """Raised when work is submitted to a scheduler that is shutting down."""
+
+
+class ApplicationScheduler:
+    """
+    In-process scheduler that runs job applications on a fixed number of
+    asyncio workers.
+
+    Work is submitted as (kind, application_id) pairs and dispatched to
+    the handler registered for that kind, so both the automation service
+    path and the local Playwright path share one concurrency limit.
+    Submitted work is stored in a durable SQLiteJobQueue. Workers claim
+    it under a lease that they renew while the handler runs, so work
+    that was pending or in progress when the process died is picked up
+    again after a restart. Handlers return True on success, and the job
+    is completed as SUCCEEDED or FAILED accordingly. Work whose lease
+    keeps expiring is given up after the queue's `max_attempts`, and the
+    abandon handler is called so the application is failed as well.
+    """
+
+    def __init__(
+        self,
+        queue: Optional[SQLiteJobQueue] = None,
+        workers: int = APPLICATION_WORKERS,
+    ):
+        self.queue = queue or SQLiteJobQueue()
+        self.workers = max(1, workers)
+        self.worker_prefix = uuid.uuid4().hex[:8]
+        self._handlers: Dict[str, Callable[[str], Awaitable[Any]]] = {}
+        self._abandon_handler: Optional[Callable[[str, int], Awaitable[Any]]] = None
+        self._wakeups: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._accepting = True
+        self._draining = False
+        self._in_flight = 0
+        self._idle: Optional[asyncio.Event] = None
+        self._submitted = 0
+        # Runs by outcome: the handler returned True or False, raised, or
+        # the queue gave up on the job after its last attempt
+        self._succeeded = 0
+        self._failed = 0
+        self._errored = 0
+        self._abandoned = 0
+
+    def register(self, kind: str, handler: Callable[[str], Awaitable[Any]]):
+        """Register the coroutine function that processes a kind of work."""
+        self._handlers[kind] = handler
+
+    def register_abandon_handler(self, handler: Callable[[str, int], Awaitable[Any]]):
+        """
+        Register the coroutine function called with an application ID and
+        its attempt count when its work is given up.
+        """
+        self._abandon_handler = handler
+
+    def start(self):
+        """Start the workers on the running event loop."""
+        if self._tasks:
+            return
+        self._wakeups = asyncio.Queue()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._accepting = True
+        self._draining = False
+        self._tasks = [
+            asyncio.create_task(self._worker(f"{self.worker_prefix}-{index}"))
+            for index in range(self.workers)
+        ]
+        logger.info(f"Application scheduler started with {self.workers} worker(s)")
+
+    async def submit(self, kind: str, application_id: str):
+        """
+        Queue an application for processing.
+        Raises SchedulerClosedError once the scheduler is draining.
+        """
+        await self.submit_many(kind, [application_id])
+
+    async def submit_many(self, kind: str, application_ids: Iterable[str]):
+        """
+        Queue many applications in a single queue transaction.
+        Raises SchedulerClosedError once the scheduler is draining.
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"No handler registered for {kind}")
+        if not self._accepting:
+            raise SchedulerClosedError("Scheduler is shutting down")
+        if not self._tasks:
+            self.start()
+
+        job_ids = await self.queue.enqueue_many(kind, application_ids)
+        self._submitted += len(job_ids)
+        for _ in job_ids:
+            self._wakeups.put_nowait(None)
+
+    async def drain(self, timeout: Optional[float] = None):
+        """
+        Stop accepting and claiming work, wait for in-flight applications
+        to finish, then stop the workers. Queued work stays in the durable
+        queue for the next start. Work still running after `timeout`
+        seconds is cancelled, and its lease expires so it is retried.
+        """
+        self._accepting = False
+        self._draining = True
+        if not self._tasks:
+            return
+
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Scheduler drain timed out with {self._in_flight} in flight")
+
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self.queue.close()
+        logger.info("Application scheduler drained")
+
+    async def stats(self) -> Dict[str, Any]:
+        """Return queue depth, in-flight and throughput counters."""
+        queue_counts = await self.queue.stats() if self._tasks else {}
+        return {
+            "workers": self.workers,
+            "accepting": self._accepting,
+            "queue_depth": queue_counts.get(ApplicationStatus.PENDING.value, 0),
+            "in_flight": self._in_flight,
+            "submitted": self._submitted,
+            "succeeded": self._succeeded,
+            "failed": self._failed,
+            "errored": self._errored,
+            "abandoned": self._abandoned,
+            "queue": queue_counts,
+        }
+
+    async def _worker(self, worker_id: str):
+        while not self._draining:
+            try:
+                await self._fail_expired()
+                job = await self.queue.claim(worker_id)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} could not claim work: {str(e)}")
+                await asyncio.sleep(IDLE_POLL_SECONDS)
+                continue
+
+            if job is None:
+                # Sleep until work is submitted or it is time to look for
+                # expired leases again
+                try:
+                    await asyncio.wait_for(self._wakeups.get(), IDLE_POLL_SECONDS)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            if self._draining:
+                # Claimed during shutdown, hand it back for the next start
+                await self.queue.release(job)
+                return
+            await self._process(job, worker_id)
+
+    async def _fail_expired(self):
+        for job in await self.queue.fail_expired():
+            self._abandoned += 1
+            logger.error(
+                f"Gave up on application {job.application_id} after {job.attempts} attempt(s)"
+            )
+            if self._abandon_handler is None:
+                continue
+            try:
+                await self._abandon_handler(job.application_id, job.attempts)
+            except Exception as e:
+                logger.error(f"Could not fail application {job.application_id}: {str(e)}")
+
+    async def _process(self, job: QueuedJob, worker_id: str):
+        handler = self._handlers.get(job.kind)
+        self._in_flight += 1
+        self._idle.clear()
+        heartbeat = asyncio.create_task(self._heartbeat(job, worker_id))
+        status = ApplicationStatus.FAILED
+        try:
+            if handler is None:
+                raise ValueError(f"No handler registered for {job.kind}")
+            if await handler(job.application_id):
+                status = ApplicationStatus.SUCCEEDED
+                self._succeeded += 1
+            else:
+                self._failed += 1
+        except Exception as e:
+            self._errored += 1
+            logger.error(
+                f"Worker {worker_id} failed processing application {job.application_id}: {str(e)}"
+            )
+        finally:
+            heartbeat.cancel()
+            await asyncio.gather(heartbeat, return_exceptions=True)
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+        try:
+            await self.queue.complete(job, status)
+        except Exception as e:
+            # Keep the worker alive; the job's lease expires and it is retried
+            logger.error(f"Worker {worker_id} could not complete job {job.id}: {str(e)}")
+
+    async def _heartbeat(self, job: QueuedJob, worker_id: str):
+        while True:
+            await asyncio.sleep(self.queue.lease_seconds / 3)
+            if not await self.queue.renew(job, worker_id):
+                logger.warning(f"Worker {worker_id} lost the lease on job {job.id}")
+                return
+
+
+# Singleton instance
+application_scheduler = None
+
+
+def get_application_scheduler() -> ApplicationScheduler:
+    """
+    Get or create the ApplicationScheduler singleton instance.
+    """
+    global application_scheduler
+    if application_scheduler is None:
+        application_scheduler = ApplicationScheduler()
+    return application_scheduler
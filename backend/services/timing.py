@@ -0,0 +1,115 @@
+import bisect
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterable, List
+
+# Histogram bucket upper bounds in milliseconds
+STAGE_BUCKETS_MS = [50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000]
+
+
+class SpanRecorder:
+    """
+    Records how long each stage of one application run took.
+
+    Spans are kept in the order their stages finished, as dicts in the
+    shape of models.StageSpan. A stage that ran more than once, such as
+    a retried submit, gets one span per run.
+    """
+
+    def __init__(self):
+        self.spans: List[Dict[str, Any]] = []
+
+    @contextmanager
+    def span(self, stage: str):
+        """
+        Time the body of a `with` block as one stage. The stage failed
+        if the body raises, or if it sets `ok` to False on the yielded
+        dict, e.g. for a call that reports failure in its result.
+        """
+        started_at = datetime.now()
+        start = time.perf_counter()
+        outcome = {"ok": True}
+        try:
+            yield outcome
+        except BaseException:
+            outcome["ok"] = False
+            raise
+        finally:
+            duration_ms = round((time.perf_counter() - start) * 1000, 1)
+            self.add(stage, started_at, duration_ms, outcome["ok"])
+
+    def add(self, stage: str, started_at: datetime, duration_ms: float, ok: bool = True):
+        """Record a stage timed elsewhere, e.g. by the automation service."""
+        self.spans.append(
+            {"stage": stage, "started_at": started_at, "duration_ms": duration_ms, "ok": ok}
+        )
+
+
+class StageHistogram:
+    """
+    Durations of one stage, counted into STAGE_BUCKETS_MS.
+    """
+
+    __slots__ = ("counts", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        # The last bucket counts durations above every bound
+        self.counts = [0] * (len(STAGE_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, duration_ms: float):
+        self.counts[bisect.bisect_left(STAGE_BUCKETS_MS, duration_ms)] += 1
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+
+    def stats(self) -> Dict[str, Any]:
+        bounds = [str(bound) for bound in STAGE_BUCKETS_MS] + ["+Inf"]
+        return {
+            "count": self.count,
+            "mean_ms": round(self.total_ms / self.count, 1) if self.count else 0.0,
+            "max_ms": self.max_ms,
+            "buckets": dict(zip(bounds, self.counts)),
+        }
+
+
+class StageTimings:
+    """
+    Stage duration histograms per job board, across all applications.
+    """
+
+    def __init__(self):
+        self._histograms: Dict[str, Dict[str, StageHistogram]] = {}
+
+    def observe(self, board: str, spans: Iterable[Dict[str, Any]]):
+        """Add an application's spans to its board's histograms."""
+        stages = self._histograms.setdefault(board, {})
+        for span in spans:
+            histogram = stages.get(span["stage"])
+            if histogram is None:
+                histogram = stages[span["stage"]] = StageHistogram()
+            histogram.observe(span["duration_ms"])
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the histograms as board -> stage -> summary."""
+        return {
+            board: {stage: histogram.stats() for stage, histogram in stages.items()}
+            for board, stages in self._histograms.items()
+        }
+
+
+# Singleton instance
+stage_timings = None
+
+
+def get_stage_timings() -> StageTimings:
+    """
+    Get or create the StageTimings singleton instance.
+    """
+    global stage_timings
+    if stage_timings is None:
+        stage_timings = StageTimings()
+    return stage_timings
@@ -0,0 +1,87 @@
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+from models import User
+
+# Number of verified tokens kept
+TOKEN_CACHE_SIZE = int(os.environ.get("TOKEN_CACHE_SIZE", "10000"))
+
+
+class CachedToken:
+    """
+    A verified token: its decoded claims and the user it resolved to.
+    """
+
+    __slots__ = ("claims", "user", "expires_at")
+
+    def __init__(self, claims: Dict[str, Any], user: User, expires_at: float):
+        self.claims = claims
+        self.user = user
+        self.expires_at = expires_at
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified access tokens.
+
+    Entries expire only with the token's `exp` claim. A change to a
+    stored user, such as disabling it, is not seen by its cached tokens
+    until they expire, so clear the cache when adding such a change.
+    """
+
+    def __init__(self, max_size: int = TOKEN_CACHE_SIZE):
+        self.max_size = max(1, max_size)
+        self._entries: "OrderedDict[str, CachedToken]" = OrderedDict()
+        self._hits = 0
+        self._misses = 0
+        self._expired = 0
+        self._evictions = 0
+
+    def get(self, token: str) -> Optional[CachedToken]:
+        """Return the cached entry for a token, if present and unexpired."""
+        entry = self._entries.get(token)
+        if entry is None:
+            self._misses += 1
+            return None
+        if entry.expires_at <= time.time():
+            self._expired += 1
+            self._misses += 1
+            self._discard(token)
+            return None
+        self._entries.move_to_end(token)
+        self._hits += 1
+        return entry
+
+    def put(self, token: str, claims: Dict[str, Any], user: User):
+        """Cache a verified token until its `exp` claim."""
+        expires_at = claims.get("exp")
+        if expires_at is None:
+            # Tokens without an expiry are never cached
+            return
+        self._discard(token)
+        self._entries[token] = CachedToken(claims, user, float(expires_at))
+        while len(self._entries) > self.max_size:
+            oldest = next(iter(self._entries))
+            self._discard(oldest)
+            self._evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return cache size and hit counters."""
+        lookups = self._hits + self._misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self._hits,
+            "misses": self._misses,
+            "hit_rate": self._hits / lookups if lookups else 0.0,
+            "expired": self._expired,
+            "evictions": self._evictions,
+        }
+
+    def _discard(self, token: str):
+        self._entries.pop(token, None)
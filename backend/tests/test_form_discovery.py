@@ -0,0 +1,31 @@
+from automation.form_discovery import compile_fill_plan
+from models import ResumeData
+
+RESUME = ResumeData(
+    name="Jane Doe",
+    title="Engineer",
+    summary="",
+    core_experience=[],
+    education=[],
+    portfolio={},
+    contact_info={"email": "jane@example.com"},
+)
+
+
+def _selectors_by_value():
+    plan = compile_fill_plan(RESUME)
+    return {value: selector for selector, value in plan.selectors.items()}
+
+
+def test_full_name_selector_excludes_first_and_last_name_fields():
+    selector = _selectors_by_value()["Jane Doe"]
+    for part in selector.split(", input"):
+        assert ":not(" in part
+        assert "[name*='firstname' i]" in part
+        assert "[autocomplete~='family-name' i]" in part
+
+
+def test_selector_lists_have_no_duplicates():
+    for selector in _selectors_by_value().values():
+        parts = selector.split(", input")
+        assert len(parts) == len(set(parts))
@@ -0,0 +1,54 @@
+import asyncio
+
+from services.log_store import LogStore
+
+
+def _messages(records):
+    return [(record.seq, record.message) for record in records]
+
+
+def test_numbering_continues_after_restart(tmp_path):
+    async def run():
+        store = LogStore(spill_dir=str(tmp_path), buffer_size=4)
+        for i in range(10):
+            store.append("app", f"line {i}")
+        await store.close()
+
+        restarted = LogStore(spill_dir=str(tmp_path), buffer_size=4)
+        await restarted.open("app")
+        record = restarted.append("app", "after restart")
+        return record, await restarted.read_from("app", 0)
+
+    record, records = asyncio.run(run())
+    assert record.seq == 10
+    assert _messages(records) == [(i, f"line {i}") for i in range(10)] + [(10, "after restart")]
+
+
+def test_read_from_joins_disk_and_memory(tmp_path):
+    async def run():
+        store = LogStore(spill_dir=str(tmp_path), buffer_size=4)
+        for i in range(200):
+            store.append("app", f"line {i}")
+        return await store.read_from("app", 3)
+
+    records = asyncio.run(run())
+    assert [record.seq for record in records] == list(range(3, 200))
+
+
+def test_released_log_is_read_from_disk_and_reopened(tmp_path):
+    async def run():
+        store = LogStore(spill_dir=str(tmp_path), buffer_size=4)
+        for i in range(6):
+            store.append("app", f"line {i}")
+        store.release("app")
+        released = store.stats()["applications"]
+        records = await store.read_from("app", 4)
+
+        await store.open("app")
+        record = store.append("app", "retrying")
+        return released, records, record
+
+    released, records, record = asyncio.run(run())
+    assert released == 0
+    assert _messages(records) == [(4, "line 4"), (5, "line 5")]
+    assert record.seq == 6
@@ -0,0 +1,56 @@
+from services.resume_parser import forget_fill_plan, get_fill_plan, parse_resume_text
+
+RESUME = """Jane Doe
+Senior Engineer
+jane@example.com
+{contact}
+Experience
+Acme Corp, Backend Engineer 2016 - 2020
+- Built ASP.NET and Node.js services
+Skills
+ASP.NET, Node.js, C#
+"""
+
+
+def test_year_range_is_not_a_phone_number():
+    parsed = parse_resume_text(RESUME.format(contact=""))
+    assert "phone" not in parsed["contact_info"]
+
+
+def test_phone_number_is_extracted():
+    parsed = parse_resume_text(RESUME.format(contact="+1 (555) 123-4567"))
+    assert parsed["contact_info"]["phone"] == "+1 (555) 123-4567"
+
+
+def test_dotted_words_are_not_websites():
+    parsed = parse_resume_text(RESUME.format(contact=""))
+    assert parsed["portfolio"] == {}
+
+
+def test_links_with_scheme_www_or_path_are_kept():
+    contact = "https://janedoe.dev\nwww.janedoe.net\ngithub.com/janedoe"
+    parsed = parse_resume_text(RESUME.format(contact=contact))
+    assert parsed["portfolio"] == {
+        "website": "https://janedoe.dev",
+        "github": "github.com/janedoe",
+    }
+
+
+class ResumesDB:
+    def __init__(self):
+        self.updates = 0
+
+    def update(self, record_id, **fields):
+        self.updates += 1
+
+
+def test_fill_plan_is_built_once_per_resume():
+    parsed = parse_resume_text(RESUME.format(contact="jane@example.com"))
+    resume = {"id": "resume-1", "parsed_data": parsed, "fill_plan": None}
+    resumes_db = ResumesDB()
+    try:
+        first = get_fill_plan(resumes_db, resume)
+        assert get_fill_plan(resumes_db, resume) is first
+        assert resumes_db.updates == 1
+    finally:
+        forget_fill_plan("resume-1")
@@ -0,0 +1,30 @@
+import asyncio
+import io
+import os
+
+from services.resume_store import ResumeFileStore
+
+
+class Upload:
+    def __init__(self, data: bytes):
+        self.size = len(data)
+        self._data = io.BytesIO(data)
+
+    async def read(self, size: int = -1) -> bytes:
+        await asyncio.sleep(0)
+        return self._data.read(size)
+
+
+def test_save_during_release_keeps_the_file(tmp_path):
+    async def run():
+        store = ResumeFileStore(str(tmp_path))
+        first = await store.save(Upload(b"%PDF resume"))
+        # Release the only reference while the same content is saved again
+        stored, _ = await asyncio.gather(
+            store.save(Upload(b"%PDF resume")), store.release(first.content_hash)
+        )
+        return store, stored
+
+    store, stored = asyncio.run(run())
+    assert os.path.exists(stored.path)
+    assert store.stats() == {"files": 1, "references": 1}
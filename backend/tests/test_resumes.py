@@ -0,0 +1,51 @@
+import asyncio
+from datetime import datetime
+
+from models import ResumeData
+from routers import resumes
+from services.resume_parser import get_fill_plan
+
+
+def _resume_data(email: str) -> ResumeData:
+    return ResumeData(
+        name="Jane Doe",
+        title="Engineer",
+        summary="",
+        core_experience=[],
+        education=[],
+        portfolio={},
+        contact_info={"email": email},
+    )
+
+
+def test_reparse_replaces_the_cached_fill_plan(monkeypatch):
+    resumes.resumes_db.create(
+        {
+            "id": "reparsed-resume",
+            "user_id": "user-1",
+            "filename": "resume.pdf",
+            "file_path": "/tmp/resume.pdf",
+            "content_hash": "hash-1",
+            "created_at": datetime.now(),
+        }
+    )
+
+    async def parse(content_hash, file_path, force=False):
+        return parsed
+
+    monkeypatch.setattr(resumes.resume_parser, "parse", parse)
+    try:
+        parsed = _resume_data("old@example.com")
+        asyncio.run(resumes.parse_resume("reparsed-resume", "hash-1", "/tmp/resume.pdf"))
+        old_plan = get_fill_plan(resumes.resumes_db, resumes.resumes_db.get("reparsed-resume"))
+        assert "old@example.com" in old_plan.selectors.values()
+
+        parsed = _resume_data("new@example.com")
+        asyncio.run(
+            resumes.parse_resume("reparsed-resume", "hash-1", "/tmp/resume.pdf", force=True)
+        )
+        new_plan = get_fill_plan(resumes.resumes_db, resumes.resumes_db.get("reparsed-resume"))
+        assert "new@example.com" in new_plan.selectors.values()
+        assert "old@example.com" not in new_plan.selectors.values()
+    finally:
+        resumes.resumes_db.delete("reparsed-resume")